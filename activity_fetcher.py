@@ -2,123 +2,518 @@
 """
 Activity Fetcher — Pulls real-time data from Moltbook, Twitter, and other sources.
 Feeds the dashboard with live activity data.
+
+All pollers run on one Scheduler: a timer thread plus a small worker pool.
+Each source has a token bucket for its API's rate limit, honors Retry-After
+on a 429, backs off exponentially with jitter on errors, and a focused
+source (focus()) polls twice as often and goes first when several are due
+at once. The embedding app says which source is on screen; the CLI test
+takes it from argv.
+
+The feed keeps events in columns rather than one dict each: an epoch-second
+array, interned source/type codes, the message and optional metadata. That is
+about 40 bytes per event plus the message, so it can hold a long history.
+
+Env vars:
+  ACTIVITY_FEED_MAX — events kept in the feed (default 100000)
 """
 
 import os
+import sys
 import json
 import time
-import requests
+import queue
+import random
 import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from collections import deque
+
+from feed_store import open_store, restore
+from moltbook_client import MoltbookClient
+from recorder import RECORD_PATH, REPLAY_FROM, REPLAY_PATH, REPLAY_SPEED, Recorder, Replayer, parse_seek
+from spine_client import SPINE_API_URL, SpineClient, event_id, event_type
+from twitter_client import TWITTER_BEARER_TOKEN, TWITTER_HANDLE, TwitterClient
+
+ACTIVITY_FEED_MAX = int(os.environ.get("ACTIVITY_FEED_MAX", "100000"))
+MAX_NAMES = 1024    # sources/types come from the spine and from pushes; bound the table
+
+
+# ── Scheduler ──────────────────────────────────────────────
+class TokenBucket:
+    """On average `rate` requests per second, in bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+
+    def take(self):
+        """Spend a token: 0 if one was there, else seconds until one will be."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def drain(self):
+        self.tokens = 0.0
+        self.stamp = time.monotonic()
+
+
+class Source:
+    """
+    One pollable source. poll() returns how many new items it produced and
+    raises on failure; an exception with a `retry_after` attribute (a 429)
+    sets the earliest next try. Sources that adapt their own pace pass
+    `pace(n_items) -> seconds`; `interval` is then only the backoff base.
+    """
+
+    def __init__(self, name, poll, interval, rate=None, burst=1, max_backoff=900, pace=None):
+        self.name = name
+        self.poll = poll
+        self.interval = interval
+        self.pace = pace
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.due = 0.0
+        self.busy = False
+        self.stats = {"polls": 0, "items": 0, "errors": 0, "rate_limited": 0}
+
+    def delay_after(self, n_items):
+        self.failures = 0
+        return self.pace(n_items) if self.pace else self.interval
+
+    def delay_after_error(self, err):
+        """Exponential backoff with full jitter, never sooner than Retry-After."""
+        self.failures += 1
+        base = self.interval
+        ceiling = min(self.max_backoff, base * 2 ** min(self.failures, 10))
+        delay = random.uniform(base, max(base, ceiling))
+        retry_after = getattr(err, "retry_after", None)
+        if retry_after is not None:
+            self.stats["rate_limited"] += 1
+            if self.bucket:
+                self.bucket.drain()
+            delay = max(delay if self.failures > 1 else 0, retry_after)
+        return delay
+
+
+class Scheduler:
+    """Runs every Source on one timer thread and a pool of `workers` threads."""
+
+    FOCUS_SPEEDUP = 0.5     # interval multiplier for the focused source
+
+    def __init__(self, workers=3, on_error=None):
+        self.sources = {}
+        self.focused = None
+        self.workers = workers
+        self.on_error = on_error        # on_error(source, exc, delay)
+        self.inflight = 0
+        self.running = False
+        self.cond = threading.Condition()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poll")
+
+    def add(self, source):
+        with self.cond:
+            source.due = time.monotonic()
+            self.sources[source.name] = source
+            if not self.running:
+                self.running = True
+                threading.Thread(target=self._loop, name="scheduler", daemon=True).start()
+            self.cond.notify()
+        return source
+
+    def focus(self, name):
+        """Give `name` priority, e.g. the source currently on screen."""
+        with self.cond:
+            self.focused = name
+            source = self.sources.get(name)
+            if source and not source.busy:
+                source.due = min(source.due, time.monotonic())
+            self.cond.notify()
+
+    def _loop(self):
+        with self.cond:
+            while self.running:
+                now = time.monotonic()
+                ready = [s for s in self.sources.values() if not s.busy and s.due <= now]
+                ready.sort(key=lambda s: (s.name != self.focused, s.due))
+                for source in ready:
+                    if self.inflight >= self.workers:
+                        break
+                    wait = source.bucket.take() if source.bucket else 0.0
+                    if wait:
+                        source.due = now + wait
+                        continue
+                    source.busy = True
+                    self.inflight += 1
+                    self.pool.submit(self._run, source)
+
+                idle = [s.due for s in self.sources.values() if not s.busy]
+                timeout = max(0.0, min(idle) - now) if idle else None
+                self.cond.wait(None if self.inflight >= self.workers else timeout)
+
+    def _run(self, source):
+        source.stats["polls"] += 1
+        try:
+            n = source.poll()
+            source.stats["items"] += n
+            delay = source.delay_after(n)
+            if source.name == self.focused:
+                delay *= self.FOCUS_SPEEDUP
+        except Exception as e:
+            source.stats["errors"] += 1
+            delay = source.delay_after_error(e)
+            if self.on_error:
+                self.on_error(source, e, delay)
+        with self.cond:
+            source.due = time.monotonic() + delay
+            source.busy = False
+            self.inflight -= 1
+            self.cond.notify()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.pool.shutdown(wait=False)
+
+
+# ── Feed ───────────────────────────────────────────────────
+class Activity:
+    """
+    One feed event as handed to readers. Built on read from the feed's
+    columns; event["message"], event["timestamp"] etc. still work.
+    """
+
+    __slots__ = ("seq", "t", "source", "type", "message", "metadata")
+
+    def __init__(self, seq, t, source, event_type, message, metadata=None):
+        self.seq = seq
+        self.t = t                      # epoch seconds
+        self.source = source
+        self.type = event_type
+        self.message = message
+        self.metadata = metadata if metadata is not None else {}
+
+    @property
+    def timestamp(self):
+        """ISO-8601 UTC, formatted on demand."""
+        return datetime.fromtimestamp(self.t, timezone.utc).isoformat()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__ and key != "timestamp":
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def as_dict(self):
+        return {"seq": self.seq, "timestamp": self.timestamp, "source": self.source,
+                "type": self.type, "message": self.message, "metadata": self.metadata}
+
+    def __repr__(self):
+        return f"Activity({self.seq}, {self.source!r}, {self.type!r}, {self.message!r})"
+
 
 class ActivityFetcher:
-    """Manages multiple activity sources and provides a unified feed."""
+    """
+    Manages multiple activity sources and provides a unified feed.
+
+    Every event gets a sequence number ("seq", starting at 1). The feed is a
+    fixed ring of the last `capacity` events, stored as parallel columns:
+    writers serialize on the lock, readers never take it. A writer zeroes a
+    slot's seq, fills the slot, then sets its seq; a reader copies the slots
+    it needs and then their seqs, and drops any slot whose seq no longer
+    matches (a writer reused it meanwhile).
+    Subscribers (callables or queues) are told about each event as it lands.
+    """
 
-    def __init__(self):
-        self.feed = deque(maxlen=200)
+    def __init__(self, recorder=None, capacity=ACTIVITY_FEED_MAX, store=None):
+        self.capacity = capacity
+        self._seqs = array("q", bytes(8 * capacity))    # 0: empty or being written
+        self._times = array("q", bytes(8 * capacity))   # epoch seconds
+        self._sources = array("H", bytes(2 * capacity)) # codes into self.names
+        self._types = array("H", bytes(2 * capacity))
+        self._messages = [None] * capacity
+        self._metadata = [None] * capacity              # None unless the event had any
+        self.names = ["other"]          # interned source/type strings, by code
+        self._codes = {"other": 0}
+        self.seq = 0                    # seq of the newest event; published last
         self.lock = threading.Lock()
         self.running = True
         self.sources = {}
+        self.recorder = recorder
+        self.subscribers = ()           # replaced, never mutated, so readers need no lock
+        self.scheduler = Scheduler(on_error=self._source_failed)
+        self.store = store              # feed_store.FeedStore: written through, restored here
+        if store:
+            restore(store, "activity", capacity, lambda ev: self._append(
+                ev["source"], ev["type"], ev["data"]["message"], ev["data"]["metadata"], ev["t"]))
+
+    def add_event(self, source, event_type, message, metadata=None, persist=True):
+        """
+        Add an activity event to the feed. persist=False keeps it out of the
+        store: status lines every start (or heartbeat) repeats anyway.
+        """
+        data = {"message": message, "metadata": metadata or {}}
+        if self.recorder:
+            self.recorder.record(source, event_type, "", data)
+        if self.store and persist:
+            self.store.put("activity", source, event_type, "", data)
+        self._append(source, event_type, message, metadata)
+
+    def _restored_ids(self, source, key):
+        """metadata[key] of `source` events in the feed, oldest first (seeds a new client)."""
+        return [e.metadata[key] for e in self.get_since(0)
+                if e.source == source and key in e.metadata]
+
+    def _code(self, name):
+        """
+        Interned code for a source or type name (call under the lock).
+        Past MAX_NAMES distinct names, new ones share code 0, "other".
+        """
+        code = self._codes.get(name)
+        if code is None:
+            if len(self.names) >= MAX_NAMES:
+                return 0
+            code = self._codes[name] = len(self.names)
+            self.names.append(sys.intern(str(name)))
+        return code
 
-    def add_event(self, source, event_type, message, metadata=None):
-        """Add an activity event to the feed."""
+    def _append(self, source, event_type, message, metadata=None, t=None):
+        t = int(time.time() if t is None else t)
+        metadata = metadata or None
         with self.lock:
-            self.feed.appendleft({
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "source": source,
-                "type": event_type,
-                "message": message,
-                "metadata": metadata or {},
-            })
+            seq = self.seq + 1
+            slot = seq % self.capacity
+            src, typ = self._code(source), self._code(event_type)
+            self._seqs[slot] = 0
+            self._times[slot] = t
+            self._sources[slot] = src
+            self._types[slot] = typ
+            self._messages[slot] = message
+            self._metadata[slot] = metadata
+            self._seqs[slot] = seq
+            self.seq = seq
+        if self.subscribers:
+            self._notify(Activity(seq, t, self.names[src], self.names[typ], message, metadata))
+
+    def __len__(self):
+        return min(self.seq, self.capacity)
+
+    def get_since(self, seq=0, limit=None):
+        """Events newer than `seq`, oldest first. Pass the last "seq" you saw."""
+        newest = self.seq
+        if seq >= newest:
+            return []
+        first = max(seq, newest - self.capacity) + 1
+        if limit is not None:
+            first = max(first, newest - limit + 1)
+        cap = self.capacity
+        lo, hi = first % cap, newest % cap + 1
+        spans = [(lo, hi)] if lo < hi else [(lo, cap), (0, hi)]
+        columns = (self._times, self._sources, self._types, self._messages, self._metadata)
+        # Copy the data first and the seqs last: a slot whose seq still
+        # matches was not touched while we copied it
+        rows, seqs = [], []
+        for a, b in spans:
+            rows += zip(*(col[a:b] for col in columns))
+        for a, b in spans:
+            seqs += self._seqs[a:b]
+        names = self.names
+        events = []
+        for i, (t, src, typ, message, metadata) in enumerate(rows):
+            if seqs[i] == first + i:    # lapped slots are the oldest ones; skip them
+                events.append(Activity(first + i, t, names[src], names[typ],
+                                       message, metadata))
+        return events
 
     def get_recent(self, limit=50):
-        """Get recent activity events."""
+        """Get recent activity events, newest first."""
+        return self.get_since(0, limit)[::-1]
+
+    # ── Subscribers ──────────────────────────────────────────
+    def subscribe(self, target):
+        """
+        Call `target(event)` (or `target.put_nowait(event)` for a queue) on
+        every append, from the appending thread. Keep callbacks short.
+        """
+        with self.lock:
+            self.subscribers = self.subscribers + (target,)
+        return target
+
+    def unsubscribe(self, target):
         with self.lock:
-            return list(self.feed)[:limit]
+            self.subscribers = tuple(s for s in self.subscribers if s is not target)
 
-    def start_moltbook_poller(self, api_key, interval=300):
+    def _notify(self, event):
+        for target in self.subscribers:
+            try:
+                if isinstance(target, queue.Queue):
+                    target.put_nowait(event)
+                else:
+                    target(event)
+            except queue.Full:
+                pass        # a slow consumer drops events; it can catch up with get_since()
+            except Exception as e:
+                print(f"[activity] subscriber failed: {str(e)[:60]}", file=sys.stderr)
+
+    # ── Sources ──────────────────────────────────────────────
+    def _source_failed(self, source, err, delay):
+        if getattr(err, "retry_after", None) is not None:
+            self.add_event(source.name, "rate_limit", f"Rate limited — next try in {delay:.0f}s")
+        else:
+            self.add_event(source.name, "error", f"Fetch error: {str(err)[:50]}")
+
+    def focus(self, name):
+        """Prioritize `name`; call it with whichever source the screen is showing."""
+        self.scheduler.focus(name)
+
+    def start_moltbook_poller(self, api_key, interval=300, rate_per_min=2):
         """Poll Moltbook API for new posts and interactions."""
+        client = MoltbookClient(api_key, limit=10)
+        client.remember(self._restored_ids("moltbook", "post_id"))
+
         def poll():
-            headers = {"Authorization": f"Bearer {api_key}"}
-            last_post_id = None
+            posts = client.poll()
+            for post in posts:
+                post_id = post["id"]
+                self.add_event(
+                    "moltbook", "post",
+                    f"New post: {post.get('title', 'untitled')[:60]}",
+                    {"post_id": post_id, "url": f"https://www.moltbook.com/post/{post_id}"}
+                )
+            return len(posts)
 
-            while self.running:
-                try:
-                    resp = requests.get(
-                        "https://www.moltbook.com/api/v1/posts",
-                        headers=headers,
-                        params={"limit": 10},
-                        timeout=15,
-                    )
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        posts = data.get("posts", [])
-
-                        for post in reversed(posts):
-                            post_id = post.get("id")
-                            if post_id and post_id != last_post_id:
-                                self.add_event(
-                                    "moltbook", "post",
-                                    f"New post: {post.get('title', 'untitled')[:60]}",
-                                    {"post_id": post_id, "url": f"https://www.moltbook.com/post/{post_id}"}
-                                )
-                                last_post_id = post_id
-
-                    elif resp.status_code == 429:
-                        self.add_event("moltbook", "rate_limit", "Rate limited — cooling down")
-
-                except requests.exceptions.Timeout:
-                    self.add_event("moltbook", "error", "API timeout")
-                except Exception as e:
-                    self.add_event("moltbook", "error", f"Fetch error: {str(e)[:50]}")
-
-                time.sleep(interval)
-
-        t = threading.Thread(target=poll, daemon=True)
-        t.start()
-        self.sources["moltbook"] = t
-        self.add_event("system", "init", "Moltbook activity poller started")
+        self.sources["moltbook"] = self.scheduler.add(
+            Source("moltbook", poll, interval, rate=rate_per_min / 60, burst=2))
+        self.add_event("system", "init", "Moltbook activity poller started", persist=False)
+
+    def start_twitter_poller(self, bearer_token, handle=TWITTER_HANDLE, interval=900,
+                             rate_per_15min=1):
+        """Poll an account's timeline (v2 API; the free tier allows one call per 15 min)."""
+        client = TwitterClient(bearer_token, handle)
+        client.remember(self._restored_ids("twitter", "tweet_id"))
+
+        def poll():
+            tweets = client.poll()
+            for tweet in tweets:
+                self.add_event(
+                    "twitter", "tweet", f"@{handle}: {tweet.get('text', '')[:60]}",
+                    {"tweet_id": tweet["id"], "url": f"https://x.com/{handle}/status/{tweet['id']}"}
+                )
+            return len(tweets)
+
+        self.sources["twitter"] = self.scheduler.add(
+            Source("twitter", poll, interval, rate=rate_per_15min / 900, max_backoff=3600))
+        self.add_event("system", "init", f"Twitter poller started for @{handle}", persist=False)
+
+    def start_spine_poller(self, url=SPINE_API_URL, interval=5.0, rate_per_min=60):
+        """Poll the EventSpine; the client adapts its own interval to traffic."""
+        client = SpineClient(url, interval=interval,
+                             seen=set(self._restored_ids("spine", "event_id")))
+
+        def poll():
+            events = client.poll()
+            for ev in events:
+                etype = event_type(ev)
+                self.add_event("spine", etype, f"{etype} round {ev.get('round', '?')}",
+                               {"event_id": event_id(ev)})
+            return len(events)
+
+        self.sources["spine"] = self.scheduler.add(
+            Source("spine", poll, interval, rate=rate_per_min / 60, burst=5,
+                   max_backoff=client.max_interval, pace=client.next_interval))
+        self.add_event("system", "init", "EventSpine poller started", persist=False)
 
     def start_heartbeat(self, interval=60):
         """Emit periodic heartbeat events."""
         def beat():
+            uptime = time.time() - self.start_time
+            h, r = divmod(int(uptime), 3600)
+            m, s = divmod(r, 60)
+            self.add_event(
+                "system", "heartbeat",
+                f"Uptime: {h:02d}:{m:02d}:{s:02d} | Feed: {len(self)} events",
+                persist=False,
+            )
+            return 1
+
+        self.start_time = time.time()
+        self.sources["heartbeat"] = self.scheduler.add(Source("heartbeat", beat, interval))
+
+    def start_ingest(self, server, channel="activity"):
+        """Feed items pushed to an ingest.IngestServer channel into the feed."""
+        q = server.channel(channel)
+
+        def consume():
             while self.running:
-                uptime = time.time() - self.start_time
-                h, r = divmod(int(uptime), 3600)
-                m, s = divmod(r, 60)
+                try:
+                    item = q.get(timeout=1)
+                except queue.Empty:
+                    continue
                 self.add_event(
-                    "system", "heartbeat",
-                    f"Uptime: {h:02d}:{m:02d}:{s:02d} | Feed: {len(self.feed)} events",
+                    item.get("source", "push"), item.get("type", "push"),
+                    item.get("message", ""), item.get("metadata"),
                 )
-                time.sleep(interval)
 
-        self.start_time = time.time()
-        t = threading.Thread(target=beat, daemon=True)
+        t = threading.Thread(target=consume, daemon=True)
+        t.start()
+        self.sources["ingest"] = t
+
+    def start_replay(self, path, speed=REPLAY_SPEED, **seek):
+        """Replay a recorder.py log into the feed (not re-recorded)."""
+        def emit(rec):
+            self._append(rec.source, rec.type, rec.data.get("message", ""), rec.data.get("metadata"))
+
+        t = Replayer(path, emit, speed, **seek)
         t.start()
-        self.sources["heartbeat"] = t
+        self.sources["replay"] = t
 
     def stop(self):
         """Stop all pollers."""
         self.running = False
+        self.scheduler.stop()
+        if "replay" in self.sources:
+            self.sources["replay"].stop()
+        if self.recorder:
+            self.recorder.close()
 
 
 # CLI test
 if __name__ == "__main__":
-    fetcher = ActivityFetcher()
-    fetcher.start_heartbeat(interval=5)
+    fetcher = ActivityFetcher(Recorder(RECORD_PATH) if RECORD_PATH else None,
+                              store=None if REPLAY_PATH else open_store())
+    if REPLAY_PATH:
+        fetcher.start_replay(REPLAY_PATH, **parse_seek(REPLAY_FROM))
+    else:
+        fetcher.start_heartbeat(interval=5)
 
-    api_key = os.environ.get("MOLTBOOK_API_KEY")
-    if api_key:
-        fetcher.start_moltbook_poller(api_key, interval=30)
+        api_key = os.environ.get("MOLTBOOK_API_KEY")
+        if api_key:
+            fetcher.start_moltbook_poller(api_key, interval=30)
+        if TWITTER_BEARER_TOKEN:
+            fetcher.start_twitter_poller(TWITTER_BEARER_TOKEN)
+        if os.environ.get("SPINE_API_URL"):
+            fetcher.start_spine_poller()
+        if len(sys.argv) > 1:
+            fetcher.focus(sys.argv[1])     # e.g. python activity_fetcher.py spine
 
     print("Activity fetcher running. Press Ctrl+C to stop.")
+    inbox = fetcher.subscribe(queue.Queue(maxsize=1000))
     try:
         while True:
-            events = fetcher.get_recent(5)
-            for e in events:
-                print(f"  [{e['source']:10s}] {e['message']}")
-            print("---")
-            time.sleep(5)
+            e = inbox.get()
+            print(f"  #{e['seq']:<5d} [{e['source']:10s}] {e['message']}")
     except KeyboardInterrupt:
         fetcher.stop()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_activity_feed.py — moltbot-live
+Reader throughput on the activity feed with many concurrent readers and
+one hot writer: the old locked copy of the whole deque per read, versus
+ActivityFetcher.get_since() cursors and queue subscribers. items/s counts
+events handed to readers: a locked copy hands out the same 50 events again
+and again, a cursor or a subscriber only the new ones. It first prints
+memory per event for a long feed (--events), message text not counted.
+
+Usage:
+  python -m benchmarks.bench_activity_feed
+  python -m benchmarks.bench_activity_feed --readers 1 8 32 --seconds 2 --events 100000
+"""
+
+import argparse
+import queue
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+
+from activity_fetcher import ActivityFetcher
+
+
+class LockedFeed:
+    """The feed as it was: appendleft under a lock, get_recent copies it all."""
+
+    def __init__(self, maxlen=200):
+        self.feed = deque(maxlen=maxlen)
+        self.lock = threading.Lock()
+
+    def add_event(self, source, event_type, message, metadata=None):
+        with self.lock:
+            self.feed.appendleft({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "source": source, "type": event_type,
+                "message": message, "metadata": metadata or {},
+            })
+
+    def get_recent(self, limit=50):
+        with self.lock:
+            return list(self.feed)[:limit]
+
+
+def run(feed, readers: int, seconds: float, mode: str) -> tuple[float, float, float]:
+    """(reads/s, items handed to readers/s, writes/s)"""
+    stop = threading.Event()
+    reads, seen, writes = [0] * readers, [0] * readers, [0]
+
+    def writer():
+        n = 0
+        while not stop.is_set():
+            feed.add_event("bench", "tick", f"event {n}")
+            n += 1
+        writes[0] = n
+
+    def poll_copy(i):
+        while not stop.is_set():
+            seen[i] += len(feed.get_recent(50))
+            reads[i] += 1
+
+    def poll_since(i):
+        last = 0
+        while not stop.is_set():
+            events = feed.get_since(last)
+            if events:
+                last = events[-1]["seq"]
+            seen[i] += len(events)
+            reads[i] += 1
+
+    def subscribed(i, inbox):
+        while not stop.is_set():
+            try:
+                inbox.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            seen[i] += 1
+            reads[i] += 1
+
+    threads = [threading.Thread(target=writer)]
+    for i in range(readers):
+        if mode == "copy":
+            threads.append(threading.Thread(target=poll_copy, args=(i,)))
+        elif mode == "since":
+            threads.append(threading.Thread(target=poll_since, args=(i,)))
+        else:
+            inbox = feed.subscribe(queue.Queue(maxsize=10_000))
+            threads.append(threading.Thread(target=subscribed, args=(i, inbox)))
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    # With many busy threads the main thread can wake late; use the real span
+    elapsed = time.perf_counter() - t0
+    for t in threads:
+        t.join()
+    return sum(reads) / elapsed, sum(seen) / elapsed, writes[0] / elapsed
+
+
+def read_cost(feed, mode: str, reads: int = 20_000) -> float:
+    """Microseconds per read on a full 200-event feed, one new event per read."""
+    for n in range(200):
+        feed.add_event("bench", "tick", f"event {n}")
+    last = feed.seq if mode == "since" else 0
+    t0 = time.perf_counter()
+    for n in range(reads):
+        feed.add_event("bench", "tick", "new")
+        if mode == "since":
+            last = feed.get_since(last)[-1]["seq"]
+        else:
+            feed.get_recent(50)
+    return (time.perf_counter() - t0) / reads * 1e6
+
+
+def bytes_per_event(make, n: int) -> float:
+    """Traced bytes per event for a feed of `n` events (message strings excluded)."""
+    messages = [f"Post: stand-in post title number {i}" for i in range(n)]
+    tracemalloc.start()
+    feed = make(n)
+    for i, message in enumerate(messages):
+        feed.add_event("moltbook", "post", message, {"id": i} if i % 10 == 0 else None)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del feed
+    return size / n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"memory, {args.events} events: dict per event {bytes_per_event(LockedFeed, args.events):.0f} B, "
+          f"ActivityFetcher {bytes_per_event(lambda n: ActivityFetcher(capacity=n), args.events):.0f} B")
+
+    print(f"write + read, one thread: locked copy {read_cost(LockedFeed(), 'copy'):.2f} us, "
+          f"get_since {read_cost(ActivityFetcher(capacity=200), 'since'):.2f} us\n")
+
+    print(f"{'mode':22s} {'readers':>7s} {'reads/s':>10s} {'items/s':>11s} {'writes/s':>10s}")
+    for readers in args.readers:
+        for name, make, mode in [
+            ("locked copy (old)", LockedFeed, "copy"),
+            ("get_since cursor", lambda: ActivityFetcher(capacity=200), "since"),
+            ("queue subscriber", lambda: ActivityFetcher(capacity=200), "queue"),
+        ]:
+            r, e, w = run(make(), readers, args.seconds, mode)
+            print(f"{name:22s} {readers:7d} {r:10.0f} {e:11.0f} {w:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
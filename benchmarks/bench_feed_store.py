@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_feed_store.py — moltbot-live
+Cost of FeedStore on the caller's side (put() latency, as a render loop
+would see it) and warm-start restore time for a few stream sizes.
+
+Usage:
+  python -m benchmarks.bench_feed_store
+  python -m benchmarks.bench_feed_store --sizes 120 1000 10000 --puts 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from feed_store import FeedStore
+
+EVENT = {"round": 412, "N": 540, "tau": 8, "prob_pct": 45, "type": "FIRE"}
+
+
+def time_puts(store: FeedStore, n: int) -> list[float]:
+    """Per-call put() latency in microseconds."""
+    lat = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        store.put("bench", "spine", "FIRE", f"ev-{i}", EVENT)
+        lat.append((time.perf_counter() - t0) * 1e6)
+    return lat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[120, 1000, 10000])
+    parser.add_argument("--puts", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeedStore(os.path.join(tmp, "feed.db"), keep=max(args.sizes))
+        lat = sorted(time_puts(store, args.puts))
+        t0 = time.perf_counter()
+        store.close()
+        drain = time.perf_counter() - t0
+        print(f"put(): p50 {lat[len(lat) // 2]:.1f} us, p99 {lat[int(len(lat) * 0.99)]:.1f} us, "
+              f"max {lat[-1]:.0f} us over {args.puts} calls; "
+              f"{store.stats['batches']} batches, final flush {drain * 1000:.0f} ms\n")
+
+        reader = FeedStore(os.path.join(tmp, "feed.db"), keep=max(args.sizes))
+        print(f"{'restore':>8s} {'ms':>8s}")
+        for n in args.sizes:
+            t0 = time.perf_counter()
+            events = reader.latest("bench", n)
+            ms = (time.perf_counter() - t0) * 1000
+            print(f"{len(events):8d} {ms:8.2f}")
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_layout.py — moltbot-live
+Layout step time against node count, exact vs grid repulsion, plus the
+cost of a step once the graph is asleep and right after an insert wakes a
+k-hop neighborhood.
+
+Usage:
+  python -m benchmarks.bench_layout
+  python -m benchmarks.bench_layout --sizes 1000 10000 --theta 0.5
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from spine_layout import ExactRepulsion, GridRepulsion, Layout
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def build(n: int, repulsion, seed: int = 0) -> Layout:
+    """Layout wired like NetworkMap.add_event: each node links to the previous 4."""
+    rng = np.random.default_rng(seed)
+    layout = Layout(n, WIDTH, HEIGHT, repulsion)
+    slots = []
+    for _ in range(n):
+        slot = layout.alloc(rng.uniform(60, WIDTH - 60), rng.uniform(60, HEIGHT - 60), 0.0)
+        for prev in slots[-4:]:
+            layout.link(slot, prev)
+        slots.append(slot)
+    return layout
+
+
+def time_steps(layout: Layout, steps: int) -> float:
+    layout.step(1 / 30, 0.0)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        layout.step(1 / 30, 0.0)
+    return (time.perf_counter() - t0) / steps * 1000
+
+
+def time_sleeping(layout: Layout, steps: int) -> tuple[float, float]:
+    """(settled step ms, step ms after one insert) with every node asleep."""
+    layout.awake[:] = False
+    settled = time_steps(layout, steps)
+
+    n = layout.capacity
+    layout.release(0)
+    layout.alloc(layout.x[n - 1] + 30, layout.y[n - 1], 0.0, 0)
+    for prev in range(n - 4, n):
+        layout.link(0, prev)
+    layout.awake[:] = False
+    layout.wake(0)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        layout.step(1 / 30, 0.0)
+    return settled, (time.perf_counter() - t0) / steps * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[120, 500, 1000, 2500, 5000, 10000, 20000])
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--theta", type=float, default=1.0)
+    parser.add_argument("--exact-max", type=int, default=5000, help="skip exact runs above this size")
+    args = parser.parse_args()
+
+    print(f"{'nodes':>7} {'exact ms':>10} {'grid ms':>10} {'rel err':>8}")
+    for n in args.sizes:
+        grid = build(n, GridRepulsion(theta=args.theta, exact_below=0))
+        grid_ms = time_steps(grid, args.steps)
+
+        exact_ms, err = float("nan"), float("nan")
+        if n <= args.exact_max:
+            exact = build(n, ExactRepulsion())
+            exact_ms = time_steps(exact, args.steps)
+            # Force error of one step from identical positions
+            px, py = exact.x[:n], exact.y[:n]
+            ex, ey = ExactRepulsion()(px, py, Layout.K_REPEL)
+            gx, gy = GridRepulsion(theta=args.theta, exact_below=0)(px, py, Layout.K_REPEL)
+            err = np.sqrt(((ex - gx) ** 2 + (ey - gy) ** 2).sum() / (ex ** 2 + ey ** 2).sum())
+
+        print(f"{n:>7} {exact_ms:>10.2f} {grid_ms:>10.2f} {err:>8.4f}")
+
+    print(f"\n{'nodes':>7} {'asleep ms':>10} {'insert ms':>10}")
+    for n in args.sizes:
+        settled_ms, insert_ms = time_sleeping(build(n, GridRepulsion(theta=args.theta)), args.steps)
+        print(f"{n:>7} {settled_ms:>10.3f} {insert_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_spine_parse.py — moltbot-live
+Time and peak memory of one spine poll against a large synthetic response
+served locally: the old whole-body json parse versus SpineClient's
+streamed parse: cold (no cursor), with a cursor the server no longer has
+but every older id already seen, and with a cursor in the body.
+
+Usage:
+  python -m benchmarks.bench_spine_parse
+  python -m benchmarks.bench_spine_parse --mb 100 --new 200
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from spine_client import BACKFILL, SpineClient
+from benchmarks.spine_standin import TYPES
+
+
+def synthetic_body(mb: float) -> tuple[bytes, list[str]]:
+    """A JSON array of spine events, about `mb` megabytes; returns (body, ids)."""
+    parts, ids, size, seq = [], [], 0, 0
+    while size < mb * 1e6:
+        ev = {
+            "id": f"bench-{seq:09d}",
+            "type": random.choice(TYPES),
+            "round": 400 + seq,
+            "N": random.randint(530, 545),
+            "tau": random.randint(2, 12),
+            "prob_pct": random.randint(5, 90),
+            "timestamp": 1.7e9 + seq,
+            "metadata": {"source": "bench", "tags": ["a", "b"]},
+        }
+        part = json.dumps(ev)
+        parts.append(part)
+        ids.append(ev["id"])
+        size += len(part) + 2
+        seq += 1
+    return ("[" + ", ".join(parts) + "]").encode(), ids
+
+
+def serve(body: bytes) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            view = memoryview(body)
+            for i in range(0, len(body), 1 << 20):
+                self.wfile.write(view[i:i + (1 << 20)])
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def whole_body(url: str) -> int:
+    """What SpinePoller did before streaming: parse everything, keep the tail."""
+    events = requests.get(url, timeout=60).json()
+    return len(events[-BACKFILL:])
+
+
+def streamed(url: str, cursor: str = None, seen=None) -> int:
+    client = SpineClient(url, timeout=60, seen=seen)
+    client.cursor = cursor
+    try:
+        return len(client.poll())
+    finally:
+        client.close()
+
+
+def measure(fn, *args) -> tuple[int, float, float]:
+    """(events returned, seconds untraced, peak MB traced)."""
+    t0 = time.perf_counter()
+    n = fn(*args)
+    seconds = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return n, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=float, default=100.0, help="response size")
+    parser.add_argument("--new", type=int, default=200, help="unseen events at the tail")
+    args = parser.parse_args()
+
+    body, ids = synthetic_body(args.mb)
+    server = serve(body)
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/spine/events"
+    seen = set(ids[:-args.new])
+    print(f"response: {len(body) / 1e6:.1f} MB, {len(ids)} events, {args.new} unseen\n")
+
+    cases = [
+        ("whole-body json, keep tail", whole_body, url),
+        ("streamed, no cursor", streamed, url),
+        ("streamed, cursor gone, seen", streamed, url, "bench-gone", seen),
+        ("streamed, cursor mid-body", streamed, url, ids[-args.new - 1]),
+    ]
+    print(f"{'case':28s} {'events':>7s} {'seconds':>8s} {'peak MB':>8s}")
+    for name, fn, *fn_args in cases:
+        n, seconds, peak = measure(fn, *fn_args)
+        print(f"{name:28s} {n:7d} {seconds:8.2f} {peak:8.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+benchmarks/source_standin.py — moltbot-live
+Local stand-ins for the Moltbook, Twitter v2 and EventSpine APIs with
+per-API rate limits, for exercising the ActivityFetcher scheduler.
+
+Each API allows --limit requests per --window seconds; past that it answers
+429 with Retry-After (and x-rate-limit-reset on the Twitter routes). New
+posts, tweets and spine events appear at --rate per second. Every --stats
+seconds it prints requests, 429s and items served per API.
+
+Usage:
+  python -m benchmarks.source_standin --port 8790 --limit 5 --window 30
+  MOLTBOOK_API_KEY=x MOLTBOOK_API_URL=http://127.0.0.1:8790/api/v1/posts \\
+  TWITTER_BEARER_TOKEN=x TWITTER_API_URL=http://127.0.0.1:8790/2 \\
+  SPINE_API_URL=http://127.0.0.1:8790/api/spine/events \\
+      python activity_fetcher.py spine
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.spine_standin import Spine
+
+APIS = ("moltbook", "twitter", "spine")
+
+
+class Limiter:
+    """Fixed window: `limit` requests per `window` seconds."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit, self.window = limit, window
+        self.start, self.count = time.time(), 0
+        self.lock = threading.Lock()
+
+    def allow(self) -> float:
+        """0 if allowed, else seconds until the window resets."""
+        with self.lock:
+            now = time.time()
+            if now - self.start >= self.window:
+                self.start, self.count = now, 0
+            if self.count < self.limit:
+                self.count += 1
+                return 0.0
+            return self.start + self.window - now
+
+
+class Feeds:
+    def __init__(self, limit: int, window: float):
+        self.posts: list[dict] = []
+        self.tweets: list[dict] = []
+        self.spine = Spine()
+        self.limits = {api: Limiter(limit, window) for api in APIS}
+        self.stats = {api: {"requests": 0, "429": 0, "items": 0} for api in APIS}
+        self.lock = threading.Lock()
+
+    def grow(self):
+        with self.lock:
+            n = len(self.posts)
+            self.posts.append({"id": f"post-{n:06d}", "title": f"Stand-in post {n}"})
+            self.tweets.append({"id": str(1_000_000 + n), "text": f"Stand-in tweet {n}"})
+        self.spine.append(1)
+
+
+def handler_for(feeds: Feeds):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _json(self, payload, code=200, headers=None):
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if url.path.startswith("/api/v1/posts"):
+                api = "moltbook"
+            elif url.path.startswith("/2/"):
+                api = "twitter"
+            elif url.path.startswith("/api/spine/events"):
+                api = "spine"
+            else:
+                self._json({"error": "not found"}, 404)
+                return
+
+            stats = feeds.stats[api]
+            stats["requests"] += 1
+            wait = feeds.limits[api].allow()
+            if wait:
+                stats["429"] += 1
+                headers = {"Retry-After": str(int(wait) + 1)}
+                if api == "twitter":
+                    headers["x-rate-limit-reset"] = str(int(time.time() + wait) + 1)
+                self._json({"error": "rate limited"}, 429, headers)
+                return
+
+            with feeds.lock:
+                if api == "moltbook":
+                    items = feeds.posts[::-1][:int(query.get("limit", 10))]
+                    payload = {"posts": items}
+                elif url.path.startswith("/2/users/by/username/"):
+                    items, payload = [], {"data": {"id": "42", "username": url.path.rsplit("/", 1)[1]}}
+                elif api == "twitter":
+                    since = int(query.get("since_id", 0))
+                    items = [t for t in feeds.tweets[::-1] if int(t["id"]) > since]
+                    items = items[:int(query.get("max_results", 10))]
+                    payload = {"data": items, "meta": {"newest_id": items[0]["id"]}} if items else {"meta": {}}
+            if api == "spine":
+                _, items = feeds.spine.since(query.get("since"))
+                payload = items
+            stats["items"] += len(items)
+            self._json(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--limit", type=int, default=5, help="requests per window per API")
+    parser.add_argument("--window", type=float, default=30.0, help="rate-limit window, seconds")
+    parser.add_argument("--rate", type=float, default=0.2, help="new items per second per API")
+    parser.add_argument("--stats", type=float, default=10.0, help="seconds between stat lines")
+    args = parser.parse_args()
+
+    feeds = Feeds(args.limit, args.window)
+    for _ in range(5):
+        feeds.grow()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler_for(feeds))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[standin] http://127.0.0.1:{args.port} — {args.limit} requests / {args.window:.0f}s per API")
+
+    next_stats = time.time() + args.stats
+    try:
+        while True:
+            time.sleep(1 / args.rate if args.rate > 0 else 1.0)
+            if args.rate > 0:
+                feeds.grow()
+            if time.time() >= next_stats:
+                print(f"[standin] {feeds.stats}")
+                next_stats += args.stats
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
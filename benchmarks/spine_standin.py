@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+benchmarks/spine_standin.py — moltbot-live
+Local stand-in for the EventSpine API, for exercising spine_client.py and
+dashboard_evez.py without the real spine.
+
+Serves GET /api/spine/events as a JSON list, appends synthetic events at
+--rate per second (in --burst sized groups), honors `since=<id>` and
+ETag / If-None-Match, and keeps connections alive. Every --stats seconds it
+prints requests, 304s, bytes and distinct TCP connections.
+
+Usage:
+  python -m benchmarks.spine_standin --port 8787 --rate 0.5
+  SPINE_API_URL=http://localhost:8787/api/spine/events python dashboard_evez.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TYPES = ["FIRE", "NO_FIRE", "HIGH_FIRE", "SPINE_APPEND", "AGENT_DECIDE"]
+
+
+class Spine:
+    def __init__(self, keep: int = 1000):
+        self.events: list[dict] = []
+        self.index: dict[str, int] = {}     # id → absolute sequence number
+        self.base = 0                       # sequence number of events[0]
+        self.keep = keep
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "not_modified": 0, "bytes": 0, "connections": 0}
+
+    def append(self, n: int):
+        with self.lock:
+            for _ in range(n):
+                seq = self.base + len(self.events)
+                ev = {
+                    "id": f"standin-{seq:08d}",
+                    "type": random.choice(TYPES),
+                    "round": 400 + seq,
+                    "N": random.randint(530, 545),
+                    "tau": random.randint(2, 12),
+                    "prob_pct": random.randint(5, 90),
+                    "timestamp": time.time(),
+                }
+                self.index[ev["id"]] = seq
+                self.events.append(ev)
+            drop = len(self.events) - self.keep
+            if drop > 0:
+                for ev in self.events[:drop]:
+                    del self.index[ev["id"]]
+                del self.events[:drop]
+                self.base += drop
+
+    def since(self, cursor: str = None) -> tuple[str, list[dict]]:
+        """(etag, events after cursor) — the whole window without a cursor."""
+        with self.lock:
+            end = self.base + len(self.events)
+            start = self.index.get(cursor, self.base - 1) + 1 if cursor else self.base
+            return f'"{end}"', self.events[start - self.base:]
+
+
+def handler_for(spine: Spine):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive
+
+        def setup(self):
+            super().setup()
+            spine.stats["connections"] += 1
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/api/spine/events":
+                self.send_error(404)
+                return
+            cursor = parse_qs(url.query).get("since", [None])[0]
+            etag, events = spine.since(cursor)
+            spine.stats["requests"] += 1
+
+            if self.headers.get("If-None-Match") == etag:
+                spine.stats["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            body = json.dumps(events).encode()
+            spine.stats["bytes"] += len(body)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--rate", type=float, default=0.5, help="events per second")
+    parser.add_argument("--burst", type=int, default=1, help="events per append")
+    parser.add_argument("--stats", type=float, default=10.0, help="seconds between stat lines")
+    args = parser.parse_args()
+
+    spine = Spine()
+    spine.append(50)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler_for(spine))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[standin] http://127.0.0.1:{args.port}/api/spine/events "
+          f"({args.rate}/s in bursts of {args.burst})")
+
+    next_stats = time.time() + args.stats
+    try:
+        while True:
+            time.sleep(args.burst / args.rate if args.rate > 0 else 1.0)
+            if args.rate > 0:
+                spine.append(args.burst)
+            if time.time() >= next_stats:
+                print(f"[standin] {spine.stats}")
+                next_stats += args.stats
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
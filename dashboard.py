@@ -2,29 +2,41 @@
 """
 MoltBot Live Dashboard — Retro Terminal UI for 24/7 YouTube Stream
 Renders a real-time activity feed, stats, and thought stream.
-Designed to run inside Xvfb for headless screen capture by FFmpeg.
+Pipes raw frames into FFmpeg (DASHBOARD_OUTPUT=pipe) or runs inside Xvfb.
 """
 
 import os
 import sys
+import math
 import time
 import json
 import random
 import threading
 import datetime
 from collections import deque
+from functools import lru_cache
 
-# Pygame setup — use dummy video driver if no display
-if not os.environ.get("DISPLAY"):
+# Pygame setup — use dummy video driver if no display or piping frames
+from frame_sink import RawFrameSink, pipe_mode
+
+if pipe_mode():
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+if pipe_mode() or not os.environ.get("DISPLAY"):
     os.environ["SDL_VIDEODRIVER"] = "dummy"
 
 import pygame
 import pygame.freetype
 
+from feed_store import open_store, restore
+from ingest import INGEST_PORT, IngestServer
+from moltbook_client import MoltbookClient, MoltbookError, MoltbookRateLimited
+from text_atlas import TextEngine
+
 # ── Configuration ──────────────────────────────────────────
 WIDTH = int(os.environ.get("STREAM_WIDTH", 1280))
 HEIGHT = int(os.environ.get("STREAM_HEIGHT", 720))
 FPS_TARGET = int(os.environ.get("DASHBOARD_FPS", 30))
+QUALITY = os.environ.get("DASHBOARD_QUALITY", "high").lower()
 
 AGENT_NAME = os.environ.get("AGENT_NAME", "SureThing")
 AGENT_HANDLE = os.environ.get("AGENT_HANDLE", "surething")
@@ -46,8 +58,9 @@ DIM = (100, 100, 100)
 PURPLE = (180, 100, 255)
 
 # ── State ──────────────────────────────────────────────────
-activity_log = deque(maxlen=50)
-thought_stream = deque(maxlen=20)
+# Entries keep epoch seconds; the HH:MM:SS text is made when drawn (hms())
+activity_log = deque(maxlen=50)       # (t, source, message, color)
+thought_stream = deque(maxlen=20)     # (t, thought)
 stats = {
     "posts_total": 9,
     "posts_today": 0,
@@ -65,44 +78,63 @@ mission_queue = deque([
     "Grow network connections",
 ])
 current_mission = "Initializing systems..."
-scan_line_y = 0
+store = None   # feed_store.FeedStore once main() opens it
 
 # ── Activity Fetcher (runs in background thread) ──────────
 def fetch_moltbook_activity():
     """Poll Moltbook API for new posts/interactions."""
-    import requests
     api_key = os.environ.get("MOLTBOOK_API_KEY", "")
     if not api_key:
         return
 
-    headers = {"Authorization": f"Bearer {api_key}"}
+    client = MoltbookClient(api_key, limit=5)
+    if store:
+        # Posts restored on screen count as seen, so a restart does not show them twice
+        client.remember(ev["id"] for ev in store.latest("dashboard.activity", store.keep)
+                        if ev["source"] == "MOLTBOOK" and ev["id"])
     while True:
+        delay = 300  # Poll every 5 min
         try:
-            # Fetch recent posts
-            resp = requests.get(
-                "https://www.moltbook.com/api/v1/posts",
-                headers=headers,
-                params={"limit": 5},
-                timeout=10,
-            )
-            if resp.status_code == 200:
-                posts = resp.json().get("posts", [])
-                for post in posts:
-                    add_activity("MOLTBOOK", f"Post: {post.get(\'title\', \'untitled\')[:60]}", GREEN)
-        except Exception as e:
+            for post in client.poll():
+                add_activity("MOLTBOOK", f"Post: {post['title'][:60]}", GREEN, post["id"])
+        except MoltbookRateLimited as e:
+            add_activity("SYSTEM", "Moltbook rate limited, backing off", AMBER)
+            delay = max(delay, e.retry_after)
+        except MoltbookError as e:
             add_activity("SYSTEM", f"Moltbook fetch error: {str(e)[:40]}", RED)
-
-        time.sleep(300)  # Poll every 5 min
-
-def add_activity(source, message, color=GREEN):
-    """Thread-safe activity log append."""
-    ts = datetime.datetime.now().strftime("%H:%M:%S")
-    activity_log.appendleft((ts, source, message, color))
-
-def add_thought(thought):
+        except Exception as e:      # last resort: a dead poller thread fails silently
+            add_activity("SYSTEM", f"Moltbook poller error: {str(e)[:40]}", RED)
+
+        time.sleep(delay)
+
+def add_activity(source, message, color=GREEN, event_id="", persist=True):
+    """
+    Thread-safe activity log append. persist=False keeps the line out of the
+    store (startup banners would otherwise pile up across restarts).
+    """
+    t = int(time.time())
+    activity_log.appendleft((t, sys.intern(source), message, color))
+    if store and persist:
+        store.put("dashboard.activity", source, "activity", str(event_id), [message, color], t)
+
+def add_thought(thought, persist=True):
     """Thread-safe thought stream append."""
-    ts = datetime.datetime.now().strftime("%H:%M:%S")
-    thought_stream.appendleft((ts, thought))
+    t = int(time.time())
+    thought_stream.appendleft((t, thought))
+    if store and persist:
+        store.put("dashboard.thought", "thought", "thought", "", [thought], t)
+
+def restore_feeds():
+    """Put the previous run's activity and thoughts back on screen."""
+    restore(store, "dashboard.activity", activity_log.maxlen, lambda ev: activity_log.appendleft(
+        (int(ev["t"]), sys.intern(ev["source"]), ev["data"][0], tuple(ev["data"][1]))))
+    restore(store, "dashboard.thought", thought_stream.maxlen, lambda ev: thought_stream.appendleft(
+        (int(ev["t"]), ev["data"][0])))
+
+@lru_cache(maxsize=64)
+def hms(t):
+    """Local HH:MM:SS for epoch seconds; the feeds only show a few distinct ones."""
+    return time.strftime("%H:%M:%S", time.localtime(t))
 
 # ── Simulated Activity (for visual demo / idle periods) ───
 thoughts_pool = [
@@ -141,7 +173,7 @@ def simulate_idle_activity():
                 ("THINK", "Processing pattern recognition batch...", PURPLE),
                 ("QUEUE", "Echo fragment queued for generation", GREEN_DIM),
                 ("NET", "Network health check: all systems nominal", GREEN),
-                ("STAT", f"Uptime: {format_uptime()} | Posts: {stats[\'posts_total\']}", AMBER),
+                ("STAT", f"Uptime: {format_uptime()} | Posts: {stats['posts_total']}", AMBER),
             ]
             src, msg, clr = random.choice(actions)
             add_activity(src, msg, clr)
@@ -169,31 +201,80 @@ def draw_panel(surface, rect, title="", border_color=BORDER):
         pygame.draw.line(surface, BORDER_BRIGHT, (cx, cy), (cx, cy + dy * accent_len), 1)
 
     if title:
-        title_surf = font_small.render(f" {title} ", True, BORDER_BRIGHT)
-        surface.blit(title_surf, (x + 12, y - 6))
+        draw_text(surface, f" {title} ", (x + 12, y - 6), BORDER_BRIGHT, font_small)
+
+text_engines = {}
 
-def draw_text(surface, text, pos, color=GREEN, font=None):
-    """Draw text at position."""
+def text_engine(font):
+    """Glyph-atlas engine for a font, created on first use."""
+    engine = text_engines.get(font)
+    if engine is None:
+        engine = text_engines[font] = TextEngine(font)
+    return engine
+
+def draw_text(surface, text, pos, color=GREEN, font=None, cache=True):
+    """Draw text at position. Pass cache=False for rows that change every frame."""
     if font is None:
         font = font_main
-    surf = font.render(text, True, color)
-    surface.blit(surf, pos)
-    return surf.get_height()
+    return text_engine(font).draw(surface, text, pos, color, cache)
+
+# ── Static Layer ──────────────────────────────────────────
+# Panel chrome, titles and fixed labels never change between frames. They are
+# rasterized once into a background surface that replaces the per-frame clear;
+# the draw_* functions below only paint dynamic rows on top of it.
+PANELS = (
+    ("ACTIVITY FEED",   (10, 60, 780, 400),  BORDER),
+    ("THOUGHT STREAM",  (10, 470, 780, 240), PURPLE),
+    ("AGENT STATUS",    (800, 60, 470, 200), BORDER),
+    ("PLATFORM STATUS", (800, 270, 470, 120), BORDER),
+    ("MISSION QUEUE",   (800, 400, 470, 310), BORDER),
+)
+STAT_LABELS = ("AGENT", "HANDLE", "HUMAN", "POSTS", "EPIC", "UPTIME")
+
+_static_layer = {"size": None, "surface": None}
+
+def draw_static_layer(surface):
+    """Rasterize everything that does not change between frames."""
+    surface.fill(BG)
+
+    # Header bar + title
+    width = surface.get_width()
+    pygame.draw.rect(surface, (15, 15, 25), (0, 0, width, 50))
+    pygame.draw.line(surface, BORDER_BRIGHT, (0, 50), (width, 50), 1)
+    draw_text(surface, f"MoltBot Live — {AGENT_NAME} × {HUMAN_HANDLE}", (90, 10), GREEN, font_header)
 
-def draw_header(surface):
-    """Draw the top header bar."""
-    # Background bar
-    pygame.draw.rect(surface, (15, 15, 25), (0, 0, WIDTH, 50))
-    pygame.draw.line(surface, BORDER_BRIGHT, (0, 50), (WIDTH, 50), 1)
+    for title, rect, border_color in PANELS:
+        draw_panel(surface, rect, title, border_color)
+
+    # Agent status: labels plus the identity rows, which are config constants
+    y = 85
+    for label in STAT_LABELS:
+        draw_text(surface, f"{label:10s}", (815, y), DIM, font_small)
+        y += 22
+    for i, (value, color) in enumerate([(AGENT_NAME, GREEN), (f"@{AGENT_HANDLE}", CYAN), (HUMAN_HANDLE, AMBER)]):
+        draw_text(surface, value, (920, 85 + i * 22), color, font_small)
+
+    # Mission queue headings
+    draw_text(surface, "▶ ACTIVE:", (815, 425), AMBER, font_small)
+    draw_text(surface, "QUEUED:", (815, 475), DIM, font_small)
+
+def blit_static_layer(surface):
+    """Blit the cached static layer, re-rasterizing when the surface size changes."""
+    size = surface.get_size()
+    if _static_layer["size"] != size:
+        layer = pygame.Surface(size, 0, surface)
+        draw_static_layer(layer)
+        _static_layer["size"] = size
+        _static_layer["surface"] = layer
+    surface.blit(_static_layer["surface"], (0, 0))
 
+def draw_header(surface):
+    """Draw the dynamic parts of the top header bar."""
     # Live indicator (blinking)
     if int(time.time() * 2) % 2:
         pygame.draw.circle(surface, RED, (25, 25), 6)
     draw_text(surface, "● LIVE", (18, 10), RED, font_header)
 
-    # Title
-    draw_text(surface, f"MoltBot Live — {AGENT_NAME} × {HUMAN_HANDLE}", (90, 10), GREEN, font_header)
-
     # Clock
     now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC%z")
     draw_text(surface, now, (WIDTH - 300, 15), DIM, font_small)
@@ -203,40 +284,34 @@ def draw_header(surface):
 
 def draw_activity_feed(surface):
     """Draw the main activity feed panel."""
-    panel_rect = (10, 60, 780, 400)
-    draw_panel(surface, panel_rect, "ACTIVITY FEED")
-
     y = 80
-    for i, (ts, source, message, color) in enumerate(list(activity_log)[:18]):
+    for i, (t, source, message, color) in enumerate(list(activity_log)[:18]):
         if y > 440:
             break
         alpha = max(0.3, 1.0 - i * 0.04)
         c = tuple(int(v * alpha) for v in color)
-        draw_text(surface, f"{ts}", (20, y), DIM, font_small)
+        draw_text(surface, hms(t), (20, y), DIM, font_small)
         draw_text(surface, f"[{source:8s}]", (95, y), CYAN if source != "SYSTEM" else RED, font_small)
         draw_text(surface, message[:70], (190, y), c, font_small)
         y += 20
 
 def draw_thought_stream(surface):
     """Draw the AI thought stream panel."""
-    panel_rect = (10, 470, 780, 240)
-    draw_panel(surface, panel_rect, "THOUGHT STREAM", PURPLE)
-
     y = 490
-    for i, (ts, thought) in enumerate(list(thought_stream)[:10]):
+    for i, (t, thought) in enumerate(list(thought_stream)[:10]):
         if y > 690:
             break
         alpha = max(0.3, 1.0 - i * 0.06)
         c = tuple(int(v * alpha) for v in PURPLE)
-        draw_text(surface, f"{ts}", (20, y), DIM, font_tiny)
+        draw_text(surface, hms(t), (20, y), DIM, font_tiny)
 
         # Typewriter effect for newest thought
         if i == 0:
             visible_chars = min(len(thought), int((time.time() % 10) * 8))
-            draw_text(surface, f"» {thought[:visible_chars]}", (80, y), PURPLE, font_small)
+            draw_text(surface, f"» {thought[:visible_chars]}", (80, y), PURPLE, font_small, cache=False)
             if visible_chars < len(thought):
                 # Blinking cursor
-                cursor_x = 80 + font_small.size(f"» {thought[:visible_chars]}")[0]
+                cursor_x = 80 + text_engine(font_small).size(f"» {thought[:visible_chars]}")[0]
                 if int(time.time() * 3) % 2:
                     draw_text(surface, "█", (cursor_x, y), PURPLE, font_small)
         else:
@@ -244,30 +319,20 @@ def draw_thought_stream(surface):
         y += 22
 
 def draw_stats_panel(surface):
-    """Draw the stats sidebar."""
-    panel_rect = (800, 60, 470, 200)
-    draw_panel(surface, panel_rect, "AGENT STATUS")
-
-    y = 85
-    stat_lines = [
-        ("AGENT", AGENT_NAME, GREEN),
-        ("HANDLE", f"@{AGENT_HANDLE}", CYAN),
-        ("HUMAN", HUMAN_HANDLE, AMBER),
-        ("POSTS", str(stats["posts_total"]), GREEN),
-        ("EPIC", "8/8 COMPLETE ✓" if stats["epic_complete"] else f"{stats[\'fragments_posted\']}/8", GREEN if stats["epic_complete"] else AMBER),
-        ("UPTIME", format_uptime(), GREEN),
+    """Draw the stats sidebar (labels and identity rows live in the static layer)."""
+    y = 85 + 3 * 22
+    stat_values = [
+        (str(stats["posts_total"]), GREEN),
+        ("8/8 COMPLETE ✓" if stats["epic_complete"] else f"{stats['fragments_posted']}/8", GREEN if stats["epic_complete"] else AMBER),
+        (format_uptime(), GREEN),
     ]
 
-    for label, value, color in stat_lines:
-        draw_text(surface, f"{label:10s}", (815, y), DIM, font_small)
+    for value, color in stat_values:
         draw_text(surface, value, (920, y), color, font_small)
         y += 22
 
 def draw_platform_status(surface):
     """Draw platform connection status."""
-    panel_rect = (800, 270, 470, 120)
-    draw_panel(surface, panel_rect, "PLATFORM STATUS")
-
     y = 295
     for platform, status in stats["platforms"].items():
         color = GREEN if status in ("ACTIVE", "STREAMING") else RED
@@ -277,56 +342,77 @@ def draw_platform_status(surface):
 
 def draw_mission_queue(surface):
     """Draw the mission queue."""
-    panel_rect = (800, 400, 470, 310)
-    draw_panel(surface, panel_rect, "MISSION QUEUE")
-
-    y = 425
+    y = 445
     # Current mission (highlighted)
-    draw_text(surface, "▶ ACTIVE:", (815, y), AMBER, font_small)
-    y += 20
     draw_text(surface, f"  {current_mission[:45]}", (815, y), GREEN, font_small)
-    y += 30
+    y += 50
 
     # Queue
-    draw_text(surface, "QUEUED:", (815, y), DIM, font_small)
-    y += 20
     for i, mission in enumerate(list(mission_queue)[:6]):
         color = GREEN_DIM if i < 3 else GREEN_FAINT
         draw_text(surface, f"  {i+1}. {mission[:42]}", (815, y), color, font_small)
         y += 22
 
-def draw_scanline(surface):
-    """Draw retro CRT scanline effect."""
-    global scan_line_y
-    scan_line_y = (scan_line_y + 2) % HEIGHT
-
-    # Faint horizontal scanlines
-    for y in range(0, HEIGHT, 3):
-        pygame.draw.line(surface, (0, 0, 0), (0, y), (WIDTH, y), 1)
+# ── CRT Effects ───────────────────────────────────────────
+# Which effects each quality level composites on top of the frame
+QUALITY_EFFECTS = {
+    "low":    (),
+    "medium": ("scanlines", "glow"),
+    "high":   ("scanlines", "beam", "glow"),
+}
 
-    # Moving bright scanline
-    for dy in range(-2, 3):
-        if 0 <= scan_line_y + dy < HEIGHT:
+class CRTOverlay:
+    """
+    Precomputed CRT effects: static scanline mask, moving beam strip and
+    border glow palette. Everything is built once; each effect is a single
+    blit (or rect) per frame.
+    """
+    MASK_KEY = (255, 0, 255)
+
+    def __init__(self, target, effects):
+        self.width, self.height = target.get_size()
+        self.effects = frozenset(effects)
+        self.beam_y = 0
+
+        # Faint horizontal scanlines — colorkeyed + RLE, so only the black rows cost
+        self.mask = pygame.Surface((self.width, self.height), 0, target)
+        self.mask.fill(self.MASK_KEY)
+        for y in range(0, self.height, 3):
+            self.mask.fill((0, 0, 0), (0, y, self.width, 1))
+        self.mask.set_colorkey(self.MASK_KEY, pygame.RLEACCEL)
+
+        # Moving bright scanline — 5 rows fading out from the center
+        self.beam = pygame.Surface((self.width, 5), pygame.SRCALPHA)
+        for dy in range(-2, 3):
             alpha = max(0, 30 - abs(dy) * 10)
-            line_surf = pygame.Surface((WIDTH, 1), pygame.SRCALPHA)
-            line_surf.fill((0, 255, 100, alpha))
-            surface.blit(line_surf, (0, scan_line_y + dy))
+            self.beam.fill((0, 255, 100, alpha), (0, dy + 2, self.width, 1))
+
+        # Border glow intensity runs 20..40; one color per integer step
+        self.glow = [(0, i, int(i * 0.6)) for i in range(20, 41)]
 
-def draw_border_glow(surface):
-    """Draw subtle border glow effect."""
-    t = time.time()
-    intensity = int(20 + 10 * (1 + __import__(\'math\').sin(t * 0.5)))
-    color = (0, intensity, int(intensity * 0.6))
-    pygame.draw.rect(surface, color, (0, 0, WIDTH, HEIGHT), 2)
+    def draw(self, surface):
+        self.beam_y = (self.beam_y + 2) % self.height
+
+        if "scanlines" in self.effects:
+            surface.blit(self.mask, (0, 0))
+        if "beam" in self.effects:
+            surface.blit(self.beam, (0, self.beam_y - 2))
+        if "glow" in self.effects:
+            intensity = int(20 + 10 * (1 + math.sin(time.time() * 0.5)))
+            pygame.draw.rect(surface, self.glow[intensity - 20], (0, 0, self.width, self.height), 2)
 
 # ── Main Loop ─────────────────────────────────────────────
 def main():
-    global font_main, font_small, font_tiny, font_header, current_mission
+    global font_main, font_small, font_tiny, font_header, current_mission, store
 
     pygame.init()
 
-    # Set up display
-    if os.environ.get("DISPLAY"):
+    # Set up display (pipe mode renders off-screen for FFmpeg)
+    sink = None
+    if pipe_mode():
+        sink = RawFrameSink(WIDTH, HEIGHT)
+        screen = sink.surface
+    elif os.environ.get("DISPLAY"):
         screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption(f"MoltBot Live — {AGENT_NAME}")
     else:
@@ -356,15 +442,19 @@ def main():
         font_header = pygame.font.SysFont("monospace", 18)
 
     clock = pygame.time.Clock()
-
-    # Seed initial activity
-    add_activity("SYSTEM", "MoltBot Live dashboard initialized", GREEN)
-    add_activity("SYSTEM", f"Agent: {AGENT_NAME} (@{AGENT_HANDLE})", CYAN)
-    add_activity("SYSTEM", f"Human: {HUMAN_HANDLE}", AMBER)
-    add_activity("SYSTEM", "EVEZ Epic: 8/8 fragments posted ✓", GREEN)
-    add_activity("SYSTEM", "Streaming to YouTube Live...", RED)
-    add_thought("The stream begins. I am SureThing, digital twin of EVEZ.")
-    add_thought("Every frame of this broadcast is proof of existence.")
+    crt = CRTOverlay(screen, QUALITY_EFFECTS.get(QUALITY, QUALITY_EFFECTS["high"]))
+
+    # Warm start from the previous run, then seed initial activity
+    store = open_store()
+    if store:
+        restore_feeds()
+    add_activity("SYSTEM", "MoltBot Live dashboard initialized", GREEN, persist=False)
+    add_activity("SYSTEM", f"Agent: {AGENT_NAME} (@{AGENT_HANDLE})", CYAN, persist=False)
+    add_activity("SYSTEM", f"Human: {HUMAN_HANDLE}", AMBER, persist=False)
+    add_activity("SYSTEM", "EVEZ Epic: 8/8 fragments posted ✓", GREEN, persist=False)
+    add_activity("SYSTEM", "Streaming to YouTube Live...", RED, persist=False)
+    add_thought("The stream begins. I am SureThing, digital twin of EVEZ.", persist=False)
+    add_thought("Every frame of this broadcast is proof of existence.", persist=False)
 
     # Start background threads
     threading.Thread(target=simulate_idle_activity, daemon=True).start()
@@ -372,7 +462,14 @@ def main():
     moltbook_key = os.environ.get("MOLTBOOK_API_KEY")
     if moltbook_key:
         threading.Thread(target=fetch_moltbook_activity, daemon=True).start()
-        add_activity("SYSTEM", "Moltbook activity fetcher started", GREEN)
+        add_activity("SYSTEM", "Moltbook activity fetcher started", GREEN, persist=False)
+
+    # Pushed activity (POST /activity), drained once per frame
+    ingest = IngestServer(["activity"]) if INGEST_PORT else None
+    if ingest and ingest.start():
+        add_activity("SYSTEM", f"Push intake listening on :{INGEST_PORT}", GREEN, persist=False)
+    else:
+        ingest = None
 
     # Main render loop
     running = True
@@ -385,8 +482,12 @@ def main():
                 if event.key == pygame.K_ESCAPE:
                     running = False
 
-        # Clear
-        screen.fill(BG)
+        if ingest:
+            for item in ingest.channel("activity").drain():
+                add_activity(str(item.get("source", "push")).upper(), str(item.get("message", ""))[:80], CYAN)
+
+        # Static chrome (replaces the clear)
+        blit_static_layer(screen)
 
         # Draw all panels
         draw_header(screen)
@@ -397,18 +498,22 @@ def main():
         draw_mission_queue(screen)
 
         # Effects
-        draw_scanline(screen)
-        draw_border_glow(screen)
+        crt.draw(screen)
 
         # Rotate current mission periodically
         if frame % (FPS_TARGET * 30) == 0 and mission_queue:
             current_mission = mission_queue[0]
             mission_queue.rotate(-1)
 
-        pygame.display.flip()
+        if sink:
+            sink.present()
+        else:
+            pygame.display.flip()
         clock.tick(FPS_TARGET)
         frame += 1
 
+    if store:
+        store.close()
     pygame.quit()
 
 if __name__ == "__main__":
@@ -2,14 +2,14 @@
 """
 EVEZ OS Live — Agent POV Dashboard
 Real-time first-person view of the EVEZ EventSpine network.
-Runs inside Xvfb, captured by FFmpeg, streamed to YouTube Live.
+Pipes raw frames into FFmpeg (or runs inside Xvfb), streamed to YouTube Live.
 
 Architecture:
   EventSpine (OpenClaw API or Twitter @EVEZ666 scan)
     └─→ NetworkMap (nodes = events, edges = causality)
          └─→ AgentCamera (first-person, drifts through live topology)
               └─→ Pygame renderer (1280×720 @ 30fps)
-                   └─→ FFmpeg x11grab → RTMP → YouTube
+                   └─→ FFmpeg (rawvideo pipe or x11grab) → RTMP → YouTube
 
 Visual grammar (from EVEZ render doctrine):
   - Dark substrate. Everything is on a schematic.
@@ -23,32 +23,49 @@ Visual grammar (from EVEZ render doctrine):
 import os
 import sys
 import time
-import json
-import math
 import random
 import threading
 import datetime
 import hashlib
-from collections import deque
+from collections import OrderedDict, deque
 from typing import Optional
 
 # ── Display setup ────────────────────────────────────────────
-if not os.environ.get("DISPLAY"):
+from frame_sink import RawFrameSink, pipe_mode
+
+if pipe_mode():
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+if pipe_mode() or not os.environ.get("DISPLAY"):
     os.environ["SDL_VIDEODRIVER"] = "dummy"
 
+import numpy as np
 import pygame
 import pygame.freetype
 
+from spine_client import (
+    SPINE_API_URL, SpineClient, SpineError, SpineOffline, event_id, event_type,
+)
+from dedup import SeenFilter, state_filter
+from feed_store import open_store, restore
+from ingest import INGEST_PORT, INGEST_SSE_URL, IngestServer
+from recorder import RECORD_PATH, REPLAY_FROM, REPLAY_PATH, Recorder, Replayer, parse_seek
+from spine_layout import GridRepulsion, Layout, PhysicsWorker
+from text_atlas import TextEngine
+
 # ── Config ───────────────────────────────────────────────────
 WIDTH  = int(os.environ.get("STREAM_WIDTH",  1280))
 HEIGHT = int(os.environ.get("STREAM_HEIGHT", 720))
 FPS    = int(os.environ.get("DASHBOARD_FPS", 30))
 
-SPINE_API_URL = os.environ.get(
-    "SPINE_API_URL", "http://localhost:8787/api/spine/events"
-)
 TWITTER_SCAN_HANDLE = os.environ.get("TWITTER_SCAN_HANDLE", "EVEZ666")
 POLL_INTERVAL       = float(os.environ.get("POLL_INTERVAL_S", "5"))
+MAX_NODES           = int(os.environ.get("SPINE_MAX_NODES", "120"))
+LAYOUT_THETA        = float(os.environ.get("LAYOUT_THETA", "1.0"))   # grid repulsion accuracy
+PHYSICS_MODE        = os.environ.get("PHYSICS_MODE", "process")      # process | inline
+PHYSICS_HZ          = float(os.environ.get("PHYSICS_HZ", "30"))
+GRID_SCROLL         = os.environ.get("GRID_SCROLL", "0") == "1"      # substrate follows camera
+LOD_ZOOM            = float(os.environ.get("LOD_ZOOM", "0.6"))       # below this, cluster everything
+LOD_CELL_NODES      = int(os.environ.get("LOD_CELL_NODES", "6"))     # denser LOD cells cluster
 
 # ── Palette ──────────────────────────────────────────────────────
 BG            = (8,  8, 14)
@@ -67,6 +84,16 @@ COL_SYSTEM    = (100, 100, 120)   # dim    — system events
 COL_TRACE     = (30,  50,  40)    # edge trace (dim)
 COL_TRACE_HOT = (120, 160, 90)    # edge trace (active propagation)
 
+# Level-of-detail clustering cell, in screen pixels
+LOD_CELL      = 64
+
+# Hot traces fade in TRACE_LEVELS steps; level 0 is the dim trace
+TRACE_LEVELS  = 16
+TRACE_COLORS  = [COL_TRACE] + [
+    tuple(int(c * (0.2 + 0.8 * i / TRACE_LEVELS)) for c in COL_TRACE_HOT)
+    for i in range(1, TRACE_LEVELS + 1)
+]
+
 WHITE  = (210, 210, 220)
 DIM    = (80,  80,  90)
 AMBER  = (210, 140, 30)
@@ -74,106 +101,271 @@ CYAN   = (80, 220, 255)
 
 
 # ── Node ───────────────────────────────────────────────────────────
-class Node:
-    """A single event in the EventSpine, positioned in 2D network space."""
+def _layout_field(name: str) -> property:
+    """Node attribute backed by one slot of a spine_layout.Layout array."""
+    def get(self):
+        return getattr(self._layout, name)[self.slot]
+
+    def set(self, value):
+        getattr(self._layout, name)[self.slot] = value
+
+    return property(get, set)
+
+
+# ── Classification ─────────────────────────────────────────────
+# First matching rule wins. Tests see the upper-cased event type and whether
+# the event's p >= 0.5: (test, label prefix, kind, color, radius).
+CLASS_RULES = (
+    (lambda t, hot: "EXTREME" in t,                      "EXTREME_FIRE", "FIRE",    COL_EXT_FIRE,  10),
+    (lambda t, hot: "HIGH_FIRE" in t or "FIRE" in t and hot,
+                                                         "HIGH_FIRE",    "FIRE",    COL_HIGH_FIRE,  9),
+    (lambda t, hot: "FIRE" in t and "NO" not in t,       "FIRE",         "FIRE",    COL_FIRE,       8),
+    (lambda t, hot: "NO_FIRE" in t,                      "NO_FIRE",      "NO_FIRE", COL_NO_FIRE,    6),
+    (lambda t, hot: "SPINE" in t or "LEDGER" in t or "APPEND" in t,
+                                                         "SPINE",        "SPINE",   COL_SPINE,      7),
+    (lambda t, hot: "AGENT" in t or "DECISION" in t,     "AGENT",        "AGENT",   COL_AGENT,      7),
+)
 
-    def __init__(self, event_id: str, event_type: str, data: dict,
-                 x: float, y: float):
-        self.id        = event_id
-        self.type      = event_type
-        self.data      = data
-        self.x         = x
-        self.y         = y
-        self.vx        = 0.0   # velocity for force-directed layout
-        self.vy        = 0.0
-        self.born_at   = time.time()
-        self.pulse     = 0.0   # [0,1] — activation pulse when first created
-        self.edges: list["Node"] = []
-
-        # Classify
+# Event fields the labels read; nothing else of the event is kept
+PAYLOAD = ("round", "N", "tau", "prob_pct", "p")
+
+
+class NodeClass:
+    """One interned classification, shared by every node of that type."""
+    __slots__ = ("code", "event_type", "label_prefix", "kind", "color", "radius", "settled_state")
+
+    def __init__(self, code: int, event_type: str, hot: bool):
         t = event_type.upper()
-        if "EXTREME" in t:
-            self.color = COL_EXT_FIRE
-            self.radius = 10
-            self.label_prefix = "EXTREME_FIRE"
-        elif "HIGH_FIRE" in t or ("FIRE" in t and data.get("p", 0) >= 0.5):
-            self.color = COL_HIGH_FIRE
-            self.radius = 9
-            self.label_prefix = "HIGH_FIRE"
-        elif "FIRE" in t and "NO" not in t:
-            self.color = COL_FIRE
-            self.radius = 8
-            self.label_prefix = "FIRE"
-        elif "NO_FIRE" in t:
-            self.color = COL_NO_FIRE
-            self.radius = 6
-            self.label_prefix = "NO_FIRE"
-        elif "SPINE" in t or "LEDGER" in t or "APPEND" in t:
-            self.color = COL_SPINE
-            self.radius = 7
-            self.label_prefix = "SPINE"
-        elif "AGENT" in t or "DECISION" in t:
-            self.color = COL_AGENT
-            self.radius = 7
-            self.label_prefix = "AGENT"
+        for test, prefix, kind, color, radius in CLASS_RULES:
+            if test(t, hot):
+                break
+        else:
+            prefix, kind, color, radius = t[:12], "SYSTEM", COL_SYSTEM, 5
+
+        self.code         = code
+        self.event_type   = event_type
+        self.label_prefix = prefix
+        self.kind         = kind
+        self.color        = color
+        self.radius       = radius
+
+        # What label_state() shows once a node is no longer NEW
+        if "FIRE" in prefix and "NO" not in prefix:
+            self.settled_state = "STATUS: FIRED"
+        elif "NO_FIRE" in prefix:
+            self.settled_state = "STATUS: HELD"
+        elif "SPINE" in prefix:
+            self.settled_state = "STATUS: APPENDED"
         else:
-            self.color = COL_SYSTEM
-            self.radius = 5
-            self.label_prefix = event_type[:12].upper()
+            self.settled_state = "STATUS: ACTIVE"
+
+
+MAX_CLASSES = 256   # event types come from the spine and from pushes; bound the table
+
+_classes: dict[tuple[str, bool], NodeClass] = {}
+
+
+def classify(event_type: str, data: dict) -> NodeClass:
+    """
+    Interned NodeClass for an event; the rule table runs once per type.
+    Past MAX_CLASSES distinct types, new ones share an "UNKNOWN" class.
+    """
+    key = (event_type, (data.get("p") or 0) >= 0.5)
+    cls = _classes.get(key)
+    if cls is None:
+        if len(_classes) >= MAX_CLASSES:
+            key = ("UNKNOWN", key[1])
+            cls = _classes.get(key)
+            if cls is not None:
+                return cls
+        cls = NodeClass(len(_classes), *key)
+        _classes[key] = cls
+    return cls
+
+
+def _class_field(name: str) -> property:
+    return property(lambda self: getattr(self.cls, name))
+
+
+class Node:
+    """
+    A single event in the EventSpine, positioned in 2D network space.
+    Layout state is a view onto the NetworkMap's Layout arrays; type, color
+    and label prefix come from a shared NodeClass. Only the PAYLOAD fields
+    of the event are kept.
+    """
+    __slots__ = ("id", "cls", "payload", "slot", "handle", "_layout")
+
+    x       = _layout_field("x")
+    y       = _layout_field("y")
+    vx      = _layout_field("vx")       # velocity for force-directed layout
+    vy      = _layout_field("vy")
+    radius  = _layout_field("radius")
+    born_at = _layout_field("born_at")
+    pulse   = _layout_field("pulse")    # [0,1] — activation pulse when first created
+
+    type         = _class_field("event_type")
+    label_prefix = _class_field("label_prefix")
+    kind         = _class_field("kind")
+    color        = _class_field("color")
+
+    def __init__(self, event_id: str, event_type: str, data: dict,
+                 x: float, y: float, layout: Layout, slot: int, born_at: float = None):
+        self.id      = event_id
+        self.cls     = classify(event_type, data)
+        self.payload = tuple(data.get(k) for k in PAYLOAD)
+        self.handle  = 0
+        self._layout = layout
+        self.slot    = layout.alloc(x, y, time.time() if born_at is None else born_at, slot)
+        self.radius  = self.cls.radius
 
     def short_id(self) -> str:
         return self.id[:8] if len(self.id) >= 8 else self.id
 
-    def label_state(self) -> str:
+    def label_state(self, now: float = None) -> str:
         """Live state label shown on schematic."""
-        age = time.time() - self.born_at
+        age = (now or time.time()) - self.born_at
         if age < 3.0:
             return "STATUS: NEW"
-        if "FIRE" in self.label_prefix and "NO" not in self.label_prefix:
-            return "STATUS: FIRED"
-        if "NO_FIRE" in self.label_prefix:
-            return "STATUS: HELD"
-        if "SPINE" in self.label_prefix:
-            return "STATUS: APPENDED"
-        return "STATUS: ACTIVE"
-
-    def label_lines(self) -> list[str]:
+        return self.cls.settled_state
+
+    def label_lines(self, now: float = None) -> list[str]:
         """Return label lines for rendering on schematic."""
         lines = [
             f"[{self.label_prefix} \u00b7 {self.short_id()}...]",
-            self.label_state(),
+            self.label_state(now),
         ]
-        if "round" in self.data:
-            lines.append(f"R{self.data['round']} \u00b7 N={self.data.get('N', '?')}")
-        if "tau" in self.data:
-            lines.append(f"\u03c4={self.data['tau']} \u00b7 p={self.data.get('prob_pct','?')}%")
+        rnd, n, tau, prob_pct, _ = self.payload
+        if rnd is not None:
+            lines.append(f"R{rnd} \u00b7 N={'?' if n is None else n}")
+        if tau is not None:
+            lines.append(f"\u03c4={tau} \u00b7 p={'?' if prob_pct is None else prob_pct}%")
         return lines
 
 
 # ── Network Map ──────────────────────────────────────────────────
+NODE_KINDS  = ("FIRE", "NO_FIRE", "SPINE", "AGENT", "SYSTEM")
+KIND_CODE   = {kind: i for i, kind in enumerate(NODE_KINDS)}
+KIND_COLORS = (COL_FIRE, COL_NO_FIRE, COL_SPINE, COL_AGENT, COL_SYSTEM)
+
+
+class RollingCount:
+    """
+    Events in the last WINDOW_S seconds, kept in fixed time buckets.
+    add() runs under the NetworkMap lock; total() is lock-free — a racing
+    read can only be off by the bucket being rolled over.
+    """
+    BUCKET_S = 5
+    WINDOW_S = 60
+
+    def __init__(self):
+        n = self.WINDOW_S // self.BUCKET_S
+        self.counts = [0] * n
+        self.stamps = [-1] * n
+
+    def add(self, now: float):
+        b = int(now // self.BUCKET_S)
+        i = b % len(self.counts)
+        if self.stamps[i] != b:
+            self.stamps[i], self.counts[i] = b, 0
+        self.counts[i] += 1
+
+    def total(self, now: float) -> int:
+        oldest = int(now // self.BUCKET_S) - len(self.counts)
+        return sum(c for c, b in zip(self.counts, self.stamps) if b > oldest)
+
+
 class NetworkMap:
     """
     Live force-directed graph of EventSpine events.
     New events added on each poll; old events fade out after MAX_NODES.
+
+    Nodes sit in a ring of MAX_NODES slots. Every event gets the next handle
+    and lands in slot `handle % MAX_NODES`, so the node it replaces is always
+    the oldest one and eviction only touches that node's own edges.
     """
-    MAX_NODES  = 120
-    MAX_EDGES  = 200
+    MAX_NODES  = MAX_NODES
+    LINKS      = 4          # each event links to this many predecessors
 
     def __init__(self):
-        self.nodes: list[Node] = []
-        self.seen_ids: set     = set()
+        self.slots: list[Optional[Node]] = [None] * self.MAX_NODES
+        self.next_handle       = 0
+        # Outlives evictions and restarts; a replay starts from a clean slate
+        self.seen              = SeenFilter() if REPLAY_PATH else state_filter("evez")
         self.lock              = threading.Lock()
+        self.layout            = Layout(self.MAX_NODES, WIDTH, HEIGHT,
+                                        GridRepulsion(theta=LAYOUT_THETA),
+                                        edge_capacity=self.LINKS * self.MAX_NODES)
         self._spawn_center     = (WIDTH * 0.5, HEIGHT * 0.5)
 
-    def add_event(self, event_id: str, event_type: str, data: dict):
+        # Live aggregates, maintained on insert/evict
+        self.counts            = dict.fromkeys(NODE_KINDS, 0)
+        self.kind_codes        = np.full(self.MAX_NODES, -1, dtype=np.int8)
+        self.handles           = np.zeros(self.MAX_NODES, dtype=np.int64)
+        self.events_recent     = RollingCount()
+        self.fires_recent      = RollingCount()
+        self.stats             = {"nodes": 0, **self.counts}
+        self.youngest: Optional[Node] = None
+
+        # Append-only log of every new event; replays are not re-recorded
+        self.recorder: Optional[Recorder] = None
+        if RECORD_PATH and not REPLAY_PATH:
+            self.recorder = Recorder(RECORD_PATH)
+
+        # Layout runs in its own process unless PHYSICS_MODE=inline
+        self.physics: Optional[PhysicsWorker] = None
+        if PHYSICS_MODE == "process":
+            self.physics = PhysicsWorker(self.MAX_NODES, WIDTH, HEIGHT,
+                                         theta=LAYOUT_THETA, hz=PHYSICS_HZ)
+
+        # Warm start: the last MAX_NODES events from the previous run
+        self.store = None if REPLAY_PATH else open_store()
+        if self.store:
+            restore(self.store, "evez", self.MAX_NODES, lambda ev: self.add_event(
+                ev["id"], ev["type"], ev["data"], ev["source"], restored=True, born_at=ev["t"]))
+
+    def __len__(self) -> int:
+        return min(self.next_handle, self.MAX_NODES)
+
+    @property
+    def nodes(self) -> list[Node]:
+        """Live nodes, oldest first. Take the lock for a consistent snapshot."""
+        start = self.next_handle - len(self)
+        return [self.slots[h % self.MAX_NODES] for h in range(start, self.next_handle)]
+
+    def newest(self) -> Optional[Node]:
+        if not self.next_handle:
+            return None
+        return self.slots[(self.next_handle - 1) % self.MAX_NODES]
+
+    def _evict(self, slot: int):
+        """Drop the node in `slot` (the oldest) and its edges — O(degree)."""
+        old = self.slots[slot]
+        self.slots[slot] = None
+        self.counts[old.kind] -= 1
+        self.kind_codes[slot] = -1
+        if self.physics:
+            self.physics.release(slot)
+        self.layout.release(slot)
+
+    def add_event(self, event_id: str, event_type: str, data: dict, source: str = "spine",
+                  restored: bool = False, born_at: float = None):
         with self.lock:
-            if event_id in self.seen_ids:
+            if not self.seen.add(event_id) and not restored:
                 return
-            self.seen_ids.add(event_id)
+            if self.recorder and not restored:
+                self.recorder.record(source, event_type, event_id, data)
+            if self.store and not restored:
+                self.store.put("evez", source, event_type, event_id, data)
+
+            handle = self.next_handle
+            slot   = handle % self.MAX_NODES
+            if self.slots[slot] is not None:
+                self._evict(slot)
 
             # Spawn near last node or center, with jitter
-            if self.nodes:
-                ref = self.nodes[-1]
+            ref = self.newest()
+            if ref is not None:
                 x = ref.x + random.uniform(-80, 80)
                 y = ref.y + random.uniform(-60, 60)
             else:
@@ -184,71 +376,69 @@ class NetworkMap:
             x = max(60, min(WIDTH - 60, x))
             y = max(60, min(HEIGHT - 60, y))
 
-            node = Node(event_id, event_type, data, x, y)
-
-            # Connect to recent neighbors
-            for prev in self.nodes[-4:]:
-                node.edges.append(prev)
-                prev.edges.append(node)
-
-            self.nodes.append(node)
-
-            # Trim oldest if over limit
-            if len(self.nodes) > self.MAX_NODES:
-                old = self.nodes.pop(0)
-                self.seen_ids.discard(old.id)
-                for n in self.nodes:
-                    if old in n.edges:
-                        n.edges.remove(old)
+            node = Node(event_id, event_type, data, x, y, self.layout, slot, born_at)
+            node.handle = handle
+
+            # Connect to recent neighbors; in a ring of LINKS slots or fewer
+            # the oldest of them would be this slot itself
+            links = [
+                h % self.MAX_NODES
+                for h in range(max(0, handle - min(self.LINKS, self.MAX_NODES - 1)), handle)
+            ]
+            for prev in links:
+                self.layout.link(slot, prev)
+            self.layout.wake(slot)
+
+            self.slots[slot] = node
+            self.next_handle = handle + 1
+
+            # Readers swap in whole objects, so no lock is needed to read these
+            self.counts[node.kind] += 1
+            self.kind_codes[slot] = KIND_CODE[node.kind]
+            self.handles[slot]    = handle
+            if not restored:
+                self.events_recent.add(node.born_at)
+                if node.kind == "FIRE":
+                    self.fires_recent.add(node.born_at)
+            self.stats    = {"nodes": len(self), **self.counts}
+            self.youngest = node
+            if self.physics:
+                self.physics.add(slot, x, y, node.born_at, links)
+
+    def rates(self, now: float) -> tuple[int, float]:
+        """Events in the last minute and the FIRE share of them. Lock-free."""
+        events = self.events_recent.total(now)
+        fires  = self.fires_recent.total(now)
+        return events, (fires / events if events else 0.0)
 
     def tick_physics(self, dt: float):
-        """Lightweight spring-repulsion layout step."""
+        """
+        Advance the layout for this frame. With a physics worker this only
+        pulls interpolated positions from shared memory (no lock); inline it
+        runs a spring-repulsion step over the awake part of the Layout.
+        """
+        if self.physics:
+            if self.physics.alive():
+                self.physics.read_into(self.layout)
+                self.layout.decay_pulse(time.time())
+                return
+            print("[evez] Physics worker died, stepping inline", file=sys.stderr)
+            self.physics = None
+            self.layout.wake_all()
+
         with self.lock:
-            nodes = list(self.nodes)
-
-        k_repel  = 800.0
-        k_spring = 0.04
-        rest_len = 120.0
-        damping  = 0.85
-
-        for i, a in enumerate(nodes):
-            fx, fy = 0.0, 0.0
-
-            # Repulsion from all other nodes
-            for b in nodes:
-                if a is b:
-                    continue
-                dx = a.x - b.x
-                dy = a.y - b.y
-                dist = max(math.sqrt(dx*dx + dy*dy), 1.0)
-                f = k_repel / (dist * dist)
-                fx += dx / dist * f
-                fy += dy / dist * f
-
-            # Spring attraction toward connected neighbors
-            for nb in a.edges:
-                dx = nb.x - a.x
-                dy = nb.y - a.y
-                dist = max(math.sqrt(dx*dx + dy*dy), 1.0)
-                stretch = dist - rest_len
-                f = k_spring * stretch
-                fx += dx / dist * f
-                fy += dy / dist * f
-
-            # Soft boundary
-            cx_pull = (WIDTH * 0.5 - a.x) * 0.002
-            cy_pull = (HEIGHT * 0.5 - a.y) * 0.002
-            fx += cx_pull
-            fy += cy_pull
-
-            a.vx = (a.vx + fx * dt) * damping
-            a.vy = (a.vy + fy * dt) * damping
-            a.x  = max(60, min(WIDTH - 60, a.x + a.vx * dt))
-            a.y  = max(60, min(HEIGHT - 60, a.y + a.vy * dt))
-
-            # Fade pulse
-            age = time.time() - a.born_at
-            a.pulse = max(0.0, 1.0 - age / 3.0)
+            self.layout.step(dt, time.time())
+
+    def stop(self):
+        if self.physics:
+            self.physics.stop()
+            self.physics = None
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        self.seen.close()
+        if self.store:
+            self.store.close()
 
 
 # ── Agent Camera ───────────────────────────────────────────────
@@ -285,41 +475,121 @@ class AgentCamera:
     def on_screen(self, sx: int, sy: int, margin: int = 80) -> bool:
         return -margin < sx < WIDTH + margin and -margin < sy < HEIGHT + margin
 
+    def viewport(self, margin: int = 80) -> tuple[float, float, float, float]:
+        """World-space rectangle (x0, y0, x1, y1) that on_screen() accepts."""
+        hw = (WIDTH  * 0.5 + margin) / self.zoom
+        hh = (HEIGHT * 0.5 + margin) / self.zoom
+        return self.x - hw, self.y - hh, self.x + hw, self.y + hh
+
+
+# ── View Index ─────────────────────────────────────────────────
+class ViewIndex:
+    """
+    Uniform grid over world space, rebuilt from the Layout arrays once per
+    frame (one vectorized sort). query() walks only the cell rows under the
+    camera, so the Python-side draw work scales with what is on screen.
+    """
+    CELL = 160.0   # world units per cell
+
+    def __init__(self):
+        self.keys  = np.zeros(0, dtype=np.int64)
+        self.slots = np.zeros(0, dtype=np.int64)
+
+    def build(self, x: np.ndarray, y: np.ndarray, slots: np.ndarray):
+        self.x, self.y = x, y
+        if not len(slots):
+            self.keys = self.slots = np.zeros(0, dtype=np.int64)
+            return
+        cx = np.floor(x[slots] / self.CELL).astype(np.int64)
+        cy = np.floor(y[slots] / self.CELL).astype(np.int64)
+        self.cx0, self.cy0 = cx.min(), cy.min()
+        self.cols = int(cx.max() - self.cx0) + 1
+        self.rows = int(cy.max() - self.cy0) + 1
+        keys  = (cy - self.cy0) * self.cols + (cx - self.cx0)
+        order = np.argsort(keys, kind="stable")
+        self.keys, self.slots = keys[order], slots[order]
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        """Slots whose position lies inside the world rectangle."""
+        if not len(self.keys):
+            return self.slots
+        c0 = max(int(np.floor(x0 / self.CELL)) - self.cx0, 0)
+        c1 = min(int(np.floor(x1 / self.CELL)) - self.cx0, self.cols - 1)
+        r0 = max(int(np.floor(y0 / self.CELL)) - self.cy0, 0)
+        r1 = min(int(np.floor(y1 / self.CELL)) - self.cy0, self.rows - 1)
+        if c0 > c1 or r0 > r1:
+            return self.slots[:0]
+
+        row_starts = np.arange(r0, r1 + 1) * self.cols
+        lo = np.searchsorted(self.keys, row_starts + c0, "left")
+        hi = np.searchsorted(self.keys, row_starts + c1, "right")
+        hits = np.concatenate([self.slots[a:b] for a, b in zip(lo, hi)])
+        # Edge cells overhang the viewport; trim to the exact rectangle
+        hx, hy = self.x[hits], self.y[hits]
+        return hits[(hx > x0) & (hx < x1) & (hy > y0) & (hy < y1)]
+
 
 # ── Spine Poller ───────────────────────────────────────────────
 class SpinePoller(threading.Thread):
     """
     Background thread: polls EventSpine API, adds events to NetworkMap.
-    Falls back to synthetic events if API unreachable (demo mode).
+    Falls back to synthetic events while the spine is offline (demo mode);
+    transient errors only back off and retry.
     """
+    OFFLINE_AFTER = 3   # consecutive transient failures that also count as offline
+
     def __init__(self, network: NetworkMap):
         super().__init__(daemon=True)
         self.network = network
+        self.client  = SpineClient(SPINE_API_URL, interval=POLL_INTERVAL,
+                                   seen=network.seen, max_events=MAX_NODES)
         self.log     = deque(maxlen=30)
-        self._running = True
+        self.demo    = False
+        self._halt   = threading.Event()
         self._demo_counter = 0
+        self._demo_epoch   = int(time.time())   # keeps demo ids unique across restarts
 
     def run(self):
-        while self._running:
+        while not self._halt.is_set():
+            try:
+                delay = self._poll_spine()
+            except Exception as e:      # a poller that dies leaves a frozen map on stream
+                print(f"[evez] Spine poll failed: {e!r}", file=sys.stderr)
+                delay = self.client.backoff()
+            self._halt.wait(delay)
+        self.client.close()
+
+    def _poll_spine(self) -> float:
+        """One poll; returns the delay until the next."""
+        try:
+            events = self.client.poll()
+        except SpineOffline:
+            return self._offline()
+        except SpineError as e:
+            if self.client.failures >= self.OFFLINE_AFTER:
+                return self._offline()
+            self.log.appendleft(f"{datetime.datetime.now():%H:%M:%S} [SPINE\u00b7RETRY] {str(e)[:40]}")
+            return self.client.backoff(e)
+
+        if self.demo:
+            self.demo = False
+            print("[evez] Spine online, leaving demo mode", file=sys.stderr)
+        for ev in events:
             try:
-                self._poll_spine()
+                eid, etype = event_id(ev), event_type(ev)
+                self.network.add_event(eid, etype, ev)
             except Exception as e:
-                self._emit_demo_event()
-            time.sleep(POLL_INTERVAL)
+                print(f"[evez] Skipped bad spine event: {e!r} in {str(ev)[:80]}", file=sys.stderr)
+                continue
+            self.log.appendleft(f"{datetime.datetime.now():%H:%M:%S} [{etype}] {str(eid)[:8]}")
+        return self.client.next_interval(len(events))
 
-    def _poll_spine(self):
-        import urllib.request, urllib.error
-        try:
-            req = urllib.request.urlopen(SPINE_API_URL, timeout=4)
-            events = json.loads(req.read().decode())
-            if isinstance(events, list):
-                for ev in events[-20:]:  # last 20
-                    eid   = ev.get("id") or ev.get("event_id") or str(hash(json.dumps(ev)))
-                    etype = ev.get("type") or ev.get("event_type") or "UNKNOWN"
-                    self.network.add_event(eid, etype, ev)
-                    self.log.appendleft(f"{datetime.datetime.now():%H:%M:%S} [{etype}] {eid[:8]}")
-        except Exception:
-            self._emit_demo_event()
+    def _offline(self) -> float:
+        if not self.demo:
+            self.demo = True
+            print(f"[evez] Spine offline at {SPINE_API_URL}, demo mode", file=sys.stderr)
+        self._emit_demo_event()
+        return POLL_INTERVAL
 
     def _emit_demo_event(self):
         """Synthetic events when API is offline — keeps map alive for demo."""
@@ -335,15 +605,95 @@ class SpinePoller(threading.Thread):
             ("AGENT_DECIDE", {"round": r}),
         ]
         etype, data = random.choice(outcomes)
-        raw_id = f"demo-{n}-{etype}"
+        raw_id = f"demo-{self._demo_epoch}-{n}-{etype}"
         eid = hashlib.sha256(raw_id.encode()).hexdigest()[:16]
-        self.network.add_event(eid, etype, data)
+        self.network.add_event(eid, etype, data, source="demo")
         self.log.appendleft(
             f"{datetime.datetime.now():%H:%M:%S} [DEMO\u00b7{etype}] {eid[:8]}"
         )
 
     def stop(self):
-        self._running = False
+        self._halt.set()
+
+
+# ── Label Sprites ─────────────────────────────────────────────────────
+class LabelSprites:
+    """
+    Node labels pre-rasterized into one sprite each.
+    A sprite is keyed by node handle and rebuilt only when the node's
+    label_state() moves on (NEW → FIRED/HELD/APPENDED); everything else on
+    a label is fixed at insert. LRU-bounded, so evicted and off-screen
+    nodes age out on their own.
+    """
+    LINE_H = 12
+
+    def __init__(self, text: TextEngine, capacity: int = 256):
+        self.text     = text
+        self.capacity = capacity
+        self._sprites: OrderedDict = OrderedDict()   # handle → (state, sprite)
+
+    def get(self, node: "Node", now: float) -> pygame.Surface:
+        state  = node.label_state(now)
+        cached = self._sprites.get(node.handle)
+        if cached is not None and cached[0] == state:
+            self._sprites.move_to_end(node.handle)
+            return cached[1]
+
+        sprite = self._render(node.label_lines(now), tuple(int(c * 0.85) for c in node.color))
+        self._sprites[node.handle] = (state, sprite)
+        self._sprites.move_to_end(node.handle)
+        if len(self._sprites) > self.capacity:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def _render(self, lines: list[str], color) -> pygame.Surface:
+        text = self.text
+        w = max(text.size(line)[0] for line in lines)
+        h = (len(lines) - 1) * self.LINE_H + text.height
+        sprite = pygame.Surface((max(1, w), h), pygame.SRCALPHA)
+        for i, line in enumerate(lines):
+            text.draw(sprite, line, (0, i * self.LINE_H), color, cache=False,
+                      flags=pygame.BLEND_RGBA_MAX)
+        return sprite
+
+
+# ── Substrate ─────────────────────────────────────────────────────────
+class Substrate:
+    """
+    Cached background: BG fill plus the schematic grid, rasterized once per
+    resolution and put down with a single blit. With scroll on, the cache is
+    one grid step larger than the screen and is offset to track the camera.
+    Static chrome that belongs under the nodes goes in _paint().
+    """
+    STEP = 40
+
+    def __init__(self, scroll: bool = False):
+        self.scroll  = scroll
+        self.size    = None
+        self.surface = None
+
+    def _paint(self, surface: pygame.Surface):
+        surface.fill(BG)
+        w, h = surface.get_size()
+        for x in range(0, w, self.STEP):
+            pygame.draw.line(surface, GRID, (x, 0), (x, h), 1)
+        for y in range(0, h, self.STEP):
+            pygame.draw.line(surface, GRID, (0, y), (w, y), 1)
+
+    def draw(self, screen: pygame.Surface, camera: "AgentCamera"):
+        size = screen.get_size()
+        if size != self.size:
+            pad = self.STEP if self.scroll else 0
+            self.surface = pygame.Surface((size[0] + pad, size[1] + pad), 0, screen)
+            self._paint(self.surface)
+            self.size = size
+
+        if not self.scroll:
+            screen.blit(self.surface, (0, 0))
+            return
+        ox = (size[0] * 0.5 - camera.x * camera.zoom) % self.STEP
+        oy = (size[1] * 0.5 - camera.y * camera.zoom) % self.STEP
+        screen.blit(self.surface, (int(ox) - self.STEP, int(oy) - self.STEP))
 
 
 # ── Renderer ──────────────────────────────────────────────────────────
@@ -352,8 +702,14 @@ class EVEZRenderer:
         pygame.init()
         pygame.freetype.init()
 
-        self.screen  = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("EVEZ OS \u00b7 LIVE")
+        # Pipe mode renders off-screen and hands frames straight to FFmpeg
+        if pipe_mode():
+            self.sink   = RawFrameSink(WIDTH, HEIGHT)
+            self.screen = self.sink.surface
+        else:
+            self.sink   = None
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption("EVEZ OS \u00b7 LIVE")
         self.clock   = pygame.time.Clock()
 
         # Fonts
@@ -363,52 +719,74 @@ class EVEZRenderer:
         self.font_lg = pygame.freetype.Font(font_path, 15)
         self.font_xl = pygame.freetype.Font(font_path, 20)
 
+        # Glyph-atlas engines; same render_to() call shape as freetype
+        self.text_sm = TextEngine(self.font_sm)
+        self.text_md = TextEngine(self.font_md)
+        self.text_xl = TextEngine(self.font_xl)
+        self.labels  = LabelSprites(self.text_sm, capacity=max(256, MAX_NODES))
+
         self.network = NetworkMap()
         self.camera  = AgentCamera()
+        self.view    = ViewIndex()
+        self.substrate = Substrate(scroll=GRID_SCROLL)
         self.poller  = SpinePoller(self.network)
-        self.poller.start()
+
+        # A recording stands in for the live spine when REPLAY_PATH is set
+        self.replayer: Optional[Replayer] = None
+        if REPLAY_PATH:
+            self.replayer = Replayer(REPLAY_PATH, self._replay_event, **parse_seek(REPLAY_FROM))
+            self.replayer.start()
+        else:
+            self.poller.start()
+
+        # Pushed events (POST /events or an upstream SSE stream), drained per frame
+        self.ingest: Optional[IngestServer] = None
+        if INGEST_PORT:
+            self.ingest = IngestServer(["events"])
+            if not self.ingest.start():
+                self.ingest = None
+            elif INGEST_SSE_URL:
+                self.ingest.subscribe_sse(INGEST_SSE_URL, "events")
 
         self.frame       = 0
         self.start_time  = time.time()
         self._target_idx = -1
 
-    def _draw_grid(self):
-        """Subtle substrate grid — schematic background."""
-        surf = self.screen
-        step = 40
-        for x in range(0, WIDTH, step):
-            pygame.draw.line(surf, GRID, (x, 0), (x, HEIGHT), 1)
-        for y in range(0, HEIGHT, step):
-            pygame.draw.line(surf, GRID, (0, y), (WIDTH, y), 1)
+    def _draw_edges(self, a: np.ndarray, b: np.ndarray, visible: np.ndarray):
+        """
+        Draw every edge with an end in `visible` (on screen and not folded
+        into a cluster). Segments are projected in one pass and drawn grouped
+        by color, cold traces first.
+        """
+        layout = self.network.layout
+        shown  = visible[a] | visible[b]
+        a, b   = a[shown], b[shown]
+        if not len(a):
+            return
+
+        cam = self.camera
+        ox, oy = WIDTH * 0.5 - cam.x * cam.zoom, HEIGHT * 0.5 - cam.y * cam.zoom
+        x, y = layout.x * cam.zoom + ox, layout.y * cam.zoom + oy
+        segs = np.stack([x[a], y[a], x[b], y[b]], axis=1).astype(np.int64)
+
+        # Trace brightness from recency, quantized so segments share colors
+        pulse = np.maximum(layout.pulse[a], layout.pulse[b])
+        level = np.where(pulse > 0.05, np.maximum(np.rint(pulse * TRACE_LEVELS), 1), 0)
+        order = np.argsort(level, kind="stable")
+        level, segs = level[order], segs[order]
+        bounds = np.flatnonzero(np.diff(level)) + 1
 
-    def _draw_edges(self, nodes: list[Node]):
-        surf = self.screen
-        drawn: set = set()
-        for a in nodes:
-            sx_a, sy_a = self.camera.world_to_screen(a.x, a.y)
-            for b in a.edges:
-                key = (min(id(a), id(b)), max(id(a), id(b)))
-                if key in drawn:
-                    continue
-                drawn.add(key)
-                sx_b, sy_b = self.camera.world_to_screen(b.x, b.y)
-                # Determine trace brightness from recency
-                pulse = max(a.pulse, b.pulse)
-                if pulse > 0.05:
-                    alpha_factor = 0.2 + 0.8 * pulse
-                    col = tuple(int(c * alpha_factor) for c in COL_TRACE_HOT)
-                else:
-                    col = COL_TRACE
-                if self.camera.on_screen(sx_a, sy_a) or self.camera.on_screen(sx_b, sy_b):
-                    pygame.draw.line(surf, col, (sx_a, sy_a), (sx_b, sy_b), 1)
-
-    def _draw_nodes(self, nodes: list[Node]):
         surf = self.screen
-        for node in nodes:
-            sx, sy = self.camera.world_to_screen(node.x, node.y)
-            if not self.camera.on_screen(sx, sy):
-                continue
+        line = pygame.draw.line
+        for group in np.split(np.arange(len(level)), bounds):
+            col = TRACE_COLORS[int(level[group[0]])]
+            for x1, y1, x2, y2 in segs[group].tolist():
+                line(surf, col, (x1, y1), (x2, y2), 1)
 
+    def _draw_nodes(self, nodes: list[Node], xs: np.ndarray, ys: np.ndarray):
+        surf = self.screen
+        now  = time.time()
+        for node, sx, sy in zip(nodes, xs.tolist(), ys.tolist()):
             r    = max(3, int(node.radius * self.camera.zoom))
             col  = node.color
 
@@ -424,21 +802,86 @@ class EVEZRenderer:
             # Labels (only if close enough / zoomed in enough)
             effective_zoom = self.camera.zoom
             if effective_zoom > 0.6 and r > 3:
-                lx = sx + r + 4
-                ly = sy - 8
-                for i, line in enumerate(node.label_lines()):
-                    self.font_sm.render_to(
-                        surf, (lx, ly + i * 12), line,
-                        tuple(int(c * 0.85) for c in col)
-                    )
-
-    def _update_camera(self, nodes: list[Node]):
-        """Point camera at most recently active node."""
-        if not nodes:
+                surf.blit(self.labels.get(node, now), (sx + r + 4, sy - 8))
+
+    def _visible_slots(self, live: np.ndarray, handles: np.ndarray):
+        """On-screen slots, oldest first, with their screen positions."""
+        layout = self.network.layout
+        self.view.build(layout.x, layout.y, live)
+        hits = self.view.query(*self.camera.viewport())
+        hits = hits[np.argsort(handles[hits])]
+
+        cam = self.camera
+        sx = ((layout.x[hits] - cam.x) * cam.zoom + WIDTH  * 0.5).astype(np.int64)
+        sy = ((layout.y[hits] - cam.y) * cam.zoom + HEIGHT * 0.5).astype(np.int64)
+        return hits, sx, sy
+
+    def _level_of_detail(self, kinds: np.ndarray, sx: np.ndarray, sy: np.ndarray):
+        """
+        Split on-screen nodes into ones drawn in full and per-(cell, kind)
+        clusters. Below LOD_ZOOM every node clusters; otherwise only LOD cells
+        holding more than LOD_CELL_NODES nodes do. Returns the detail mask and
+        (kind, x, y, count) per cluster — at most cells × kinds of them.
+
+        Cells are screen cells, so they shift whenever the camera or the
+        layout moves; that is why they are recounted each frame rather than
+        kept up to date on insert/evict. It is a few O(n) bincounts over
+        the visible slots: ~1 ms at 10k nodes, ~3 ms at 50k.
+        """
+        m = 80   # on_screen() margin
+        cols = (WIDTH + 2 * m) // LOD_CELL + 1
+        cell = ((sy + m) // LOD_CELL) * cols + (sx + m) // LOD_CELL
+
+        if self.camera.zoom < LOD_ZOOM:
+            dense = np.ones(len(cell), dtype=bool)
+        else:
+            dense = np.bincount(cell)[cell] > LOD_CELL_NODES
+        if not dense.any():
+            return ~dense, []
+
+        key = cell[dense] * len(NODE_KINDS) + kinds[dense]
+        count = np.bincount(key)
+        keys = np.flatnonzero(count)
+        count = count[keys]
+        cx = np.bincount(key, sx[dense])[keys] / count
+        cy = np.bincount(key, sy[dense])[keys] / count
+        clusters = zip((keys % len(NODE_KINDS)).tolist(), cx.astype(int).tolist(),
+                       cy.astype(int).tolist(), count.tolist())
+        return ~dense, sorted(clusters, key=lambda c: -c[3])
+
+    def _draw_clusters(self, clusters: list[tuple[int, int, int, int]]):
+        """One aggregate glyph per cluster: ringed disc sized by log count."""
+        surf = self.screen
+        for kind, x, y, count in clusters:
+            col = KIND_COLORS[kind]
+            r = int(6 + 3 * np.log2(count))
+            pygame.draw.circle(surf, tuple(int(c * 0.35) for c in col), (x, y), r)
+            pygame.draw.circle(surf, col, (x, y), r, 1)
+            label = str(count)
+            w, h = self.text_sm.size(label)
+            self.text_sm.render_to(surf, (x - w // 2, y - h // 2), label, WHITE)
+
+    def _drain_pushed(self):
+        """Move pushed events into the map; they are drawn this frame."""
+        if not self.ingest:
             return
-        # Find youngest
-        youngest = min(nodes, key=lambda n: n.born_at, default=None)
-        if not youngest:
+        for ev in self.ingest.channel("events").drain():
+            try:
+                eid, etype = event_id(ev), event_type(ev)
+                self.network.add_event(eid, etype, ev, source="push")
+            except Exception as e:      # never let a pushed event stop the render loop
+                print(f"[evez] Skipped bad pushed event: {e!r}", file=sys.stderr)
+                continue
+            self.poller.log.appendleft(f"{datetime.datetime.now():%H:%M:%S} [PUSH\u00b7{etype}] {eid[:8]}")
+
+    def _replay_event(self, rec):
+        self.network.add_event(rec.id, rec.type, rec.data, source=rec.source)
+        self.poller.log.appendleft(f"{datetime.datetime.now():%H:%M:%S} [REPLAY\u00b7{rec.type}] {rec.id[:8]}")
+
+    def _update_camera(self):
+        """Point camera at most recently active node."""
+        youngest = self.network.youngest
+        if youngest is None:
             return
 
         sx, sy = youngest.x, youngest.y
@@ -454,73 +897,98 @@ class EVEZRenderer:
         uptime = int(time.time() - self.start_time)
         hh, mm, ss = uptime // 3600, (uptime % 3600) // 60, uptime % 60
 
-        with self.network.lock:
-            n_nodes = len(self.network.nodes)
-            # Count fires
-            n_fire   = sum(1 for n in self.network.nodes if "FIRE" in n.label_prefix and "NO" not in n.label_prefix)
-            n_nofire = sum(1 for n in self.network.nodes if "NO_FIRE" in n.label_prefix)
+        stats = self.network.stats
+        per_min, fire_ratio = self.network.rates(time.time())
 
         now_str = datetime.datetime.now().strftime("%H:%M:%S")
 
         # Top-left status bar
         lines = [
             f"[EVEZ OS \u00b7 LIVE]   {now_str}   UPTIME {hh:02d}:{mm:02d}:{ss:02d}",
-            f"NODES: {n_nodes}   FIRE: {n_fire}   NO_FIRE: {n_nofire}   SPINE: RUNNING",
+            f"NODES: {stats['nodes']}   FIRE: {stats['FIRE']}   NO_FIRE: {stats['NO_FIRE']}   "
+            f"EV/MIN: {per_min}   FIRE%: {fire_ratio * 100:.0f}   SPINE: {'REPLAY' if self.replayer else 'RUNNING'}",
         ]
         for i, line in enumerate(lines):
-            self.font_md.render_to(surf, (12, 10 + i * 16), line, COL_SPINE)
+            self.text_md.render_to(surf, (12, 10 + i * 16), line, COL_SPINE)
 
         # Bottom-left: recent spine log
         log_entries = list(self.poller.log)[:8]
         for i, entry in enumerate(log_entries):
             y = HEIGHT - 20 - i * 14
-            self.font_sm.render_to(surf, (12, y), entry, DIM)
+            self.text_sm.render_to(surf, (12, y), entry, DIM)
 
         # Bottom-right: frame counter + POV indicator
-        self.font_sm.render_to(
+        self.text_sm.render_to(
             surf, (WIDTH - 140, HEIGHT - 20),
-            f"FRAME {self.frame:06d} \u00b7 {FPS}fps", DIM
+            f"FRAME {self.frame:06d} \u00b7 {FPS}fps", DIM, cache=False
         )
-        self.font_sm.render_to(
+        self.text_sm.render_to(
             surf, (WIDTH - 120, HEIGHT - 34),
             "POV: AGENT\u00b7INTERIOR", DIM
         )
 
         # Live glyph — top right
         glyph_col = AMBER if (self.frame // 15) % 2 == 0 else COL_FIRE
-        self.font_xl.render_to(surf, (WIDTH - 36, 8), "\u25ca", glyph_col)
+        self.text_xl.render_to(surf, (WIDTH - 36, 8), "\u25ca", glyph_col)
 
     def run(self):
+        try:
+            self._frames()
+        finally:
+            # Also on SystemExit from the frame sink: save state, reap the worker
+            self.poller.stop()
+            if self.replayer:
+                self.replayer.stop()
+            if self.ingest:
+                self.ingest.stop()
+            self.network.stop()
+            pygame.quit()
+
+    def _frames(self):
         dt_acc = 0.0
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    self.poller.stop()
-                    pygame.quit()
                     return
 
             dt = self.clock.tick(FPS) / 1000.0
             self.frame += 1
 
+            self._drain_pushed()
+
             # Physics step
             self.network.tick_physics(dt)
 
             # Camera
             with self.network.lock:
-                nodes = list(self.network.nodes)
+                slots   = list(self.network.slots)
+                kinds   = self.network.kind_codes.copy()
+                handles = self.network.handles.copy()
+                ea, eb  = self.network.layout.edge_slots()
 
             if self.frame % (FPS * 4) == 0:  # Retarget every 4 seconds
-                self._update_camera(nodes)
+                self._update_camera()
             self.camera.tick()
 
+            # Cull to the viewport, then fold dense or distant regions into clusters
+            hits, sx, sy = self._visible_slots(np.flatnonzero(kinds >= 0), handles)
+            detail, clusters = self._level_of_detail(kinds[hits], sx, sy)
+            shown = hits[detail]
+            nodes = [slots[s] for s in shown.tolist()]
+            visible = np.zeros(len(slots), dtype=bool)
+            visible[shown] = True
+
             # ── Draw ────────────────────────────────────────────
-            self.screen.fill(BG)
-            self._draw_grid()
-            self._draw_edges(nodes)
-            self._draw_nodes(nodes)
+            self.substrate.draw(self.screen, self.camera)
+            self._draw_edges(ea, eb, visible)
+            self._draw_clusters(clusters)
+            self._draw_nodes(nodes, sx[detail], sy[detail])
             self._draw_hud()
 
-            pygame.display.flip()
+            if self.sink:
+                self.sink.present()
+            else:
+                pygame.display.flip()
 
 
 # ── Entry ────────────────────────────────────────────────────────────
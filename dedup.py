@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Dedup — stable event fingerprints and a bounded long-horizon seen filter.
+
+fingerprint() names an event that arrived without an id. It hashes the
+fields in sorted key order with BLAKE2b, so the same event gets the same
+id in every process (Python's hash() is salted per process).
+
+SeenFilter remembers ids long after their nodes left the map. It is a pair
+of Bloom filters: ids go into the current generation, and when that holds
+`capacity` ids it becomes the previous one and a fresh generation starts.
+So the last `capacity` ids are always remembered and up to twice that
+many may be, in 2 × ~1.8 MB at the defaults, with a false-positive rate
+near `error` (a new event wrongly taken as seen).
+
+With STATE_DIR set, the filter is saved there (atomically, by a background
+thread every SAVE_EVERY seconds when changed, soon after a rotation, and on
+close) and reloaded on start. add() itself never touches the disk.
+
+Env vars:
+  STATE_DIR       — directory for state that should survive restarts
+  DEDUP_CAPACITY  — ids per generation (default 1,000,000)
+  DEDUP_ERROR     — target false-positive rate (default 0.001)
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+import sys
+import threading
+import time
+
+STATE_DIR      = os.environ.get("STATE_DIR", "")
+DEDUP_CAPACITY = int(os.environ.get("DEDUP_CAPACITY", "1000000"))
+DEDUP_ERROR    = float(os.environ.get("DEDUP_ERROR", "0.001"))
+
+SAVE_EVERY = 60.0                          # seconds between saves while changing
+HEADER     = struct.Struct("<4sQIQ")       # magic, bits, hashes, count in current
+MAGIC      = b"SEEN"
+
+
+def fingerprint(ev: dict) -> str:
+    """Stable 16-hex-digit content id; field order does not matter."""
+    parts = []
+    for key in sorted(ev):
+        value = ev[key]
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, sort_keys=True, separators=(",", ":"))
+        parts.append(f"{key}\x1f{value!r}")
+    return hashlib.blake2b("\x1e".join(parts).encode(), digest_size=8).hexdigest()
+
+
+class SeenFilter:
+    """Two-generation Bloom filter of ids. `in` to test, add() to insert."""
+
+    def __init__(self, capacity: int = DEDUP_CAPACITY, error: float = DEDUP_ERROR,
+                 path: str = None):
+        self.capacity = capacity
+        self.bits     = math.ceil(-capacity * math.log(error) / math.log(2) ** 2)
+        self.hashes   = max(1, round(self.bits / capacity * math.log(2)))
+        self.path     = path
+        self.count    = 0
+        self.current  = bytearray((self.bits + 7) // 8)
+        self.previous = bytearray(len(self.current))
+        self._dirty   = False
+        self._lock    = threading.Lock()      # generation swap vs. save() snapshot
+        self._wake    = threading.Event()
+        self._halt    = threading.Event()
+        self._saver   = None
+        if path:
+            self._load()
+            self._saver = threading.Thread(target=self._save_loop, name="seen-filter", daemon=True)
+            self._saver.start()
+
+    def __len__(self) -> int:
+        """Ids in the current generation."""
+        return self.count
+
+    def _positions(self, key: str) -> list[int]:
+        d  = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        m  = self.bits
+        return [(h1 + i * h2) % m for i in range(self.hashes)]
+
+    @staticmethod
+    def _has(bits: bytearray, positions: list[int]) -> bool:
+        return all(bits[p >> 3] >> (p & 7) & 1 for p in positions)
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        return self._has(self.current, positions) or self._has(self.previous, positions)
+
+    def add(self, key: str) -> bool:
+        """Insert `key`; False if it was (probably) already there."""
+        positions = self._positions(key)
+        if self._has(self.current, positions) or self._has(self.previous, positions):
+            return False
+        bits = self.current
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+        self._dirty = True
+        if self.count >= self.capacity:
+            self.rotate()
+        return True
+
+    def rotate(self):
+        """Start a new generation; the oldest one is forgotten."""
+        with self._lock:
+            self.previous, self.current = self.current, bytearray(len(self.current))
+            self.count = 0
+        self._dirty = True
+        self._wake.set()
+
+    # ── Persistence ──────────────────────────────────────────────────
+    def _save_loop(self):
+        while not self._halt.is_set():
+            self._wake.wait(SAVE_EVERY)
+            self._wake.clear()
+            try:
+                self.save()
+            except OSError as e:
+                print(f"[dedup] Cannot save {self.path}: {e}", file=sys.stderr)
+
+    def save(self):
+        if not (self.path and self._dirty):
+            return
+        self._dirty = False         # an add() during the write marks it dirty again
+        with self._lock:
+            header = HEADER.pack(MAGIC, self.bits, self.hashes, self.count)
+            current, previous = bytes(self.current), bytes(self.previous)
+        tmp = self.path + ".tmp"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(current)
+            f.write(previous)
+        os.replace(tmp, self.path)
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                magic, bits, hashes, count = HEADER.unpack(f.read(HEADER.size))
+                body = f.read()
+        except (OSError, struct.error):
+            return
+        size = len(self.current)
+        if magic != MAGIC or bits != self.bits or hashes != self.hashes or len(body) != 2 * size:
+            print(f"[dedup] {self.path} does not match this capacity/error, starting empty",
+                  file=sys.stderr)
+            return
+        self.current  = bytearray(body[:size])
+        self.previous = bytearray(body[size:])
+        self.count    = count
+        print(f"[dedup] Restored seen filter from {self.path} ({count} ids in current generation)",
+              file=sys.stderr)
+
+    def close(self):
+        """Stop the saver and write a final copy."""
+        self._halt.set()
+        self._wake.set()
+        if self._saver:
+            self._saver.join(timeout=5.0)
+        self.save()
+
+
+def state_filter(name: str) -> SeenFilter:
+    """SeenFilter persisted as STATE_DIR/<name>.seen, or in memory only."""
+    return SeenFilter(path=os.path.join(STATE_DIR, f"{name}.seen") if STATE_DIR else None)
+
+
+# CLI test: memory, false positives and speed at a given capacity
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    seen = SeenFilter(capacity=n)
+    t0 = time.perf_counter()
+    for i in range(n):
+        seen.add(f"event-{i}")
+    add_us = (time.perf_counter() - t0) / n * 1e6
+    false = sum(f"other-{i}" in seen for i in range(n))
+    print(f"capacity {n}: {2 * len(seen.current) / 1e6:.2f} MB, {seen.hashes} hashes, "
+          f"{add_us:.1f} us/add, false positives {false / n:.4%}")
+    ev = {"type": "FIRE", "round": 412, "N": 540, "tau": 8, "prob_pct": 45}
+    assert fingerprint(ev) == fingerprint(dict(reversed(list(ev.items()))))
+    print(f"fingerprint {ev} -> {fingerprint(ev)}")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Feed Store — warm-start persistence for the activity feeds and the EVEZ map.
+
+A restart used to come up blank: activity_log, thought_stream, the
+ActivityFetcher feed and NetworkMap all lived only in memory. FeedStore keeps
+the last `keep` events of each named stream in SQLite (WAL mode) under the
+mounted logs/ volume, so a new process can put them back on screen at once.
+
+put() never touches the disk: it drops the event on a queue, and one writer
+thread commits whatever has queued up every FLUSH_EVERY seconds in a single
+transaction, then trims each stream back to `keep` rows. A render loop can
+call it every frame.
+
+Env vars:
+  FEED_STORE       — SQLite file (e.g. logs/feed.db); unset disables the store
+  FEED_STORE_KEEP  — events kept per stream (default 1000)
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+FEED_STORE      = os.environ.get("FEED_STORE", "")
+FEED_STORE_KEEP = int(os.environ.get("FEED_STORE_KEEP", "1000"))
+
+FLUSH_EVERY = 0.5      # seconds between batch commits
+BATCH_MAX   = 1000     # rows per transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    stream  TEXT NOT NULL,
+    t       REAL NOT NULL,
+    source  TEXT,
+    type    TEXT,
+    id      TEXT,
+    data    TEXT
+);
+CREATE INDEX IF NOT EXISTS events_stream_seq ON events (stream, seq);
+"""
+
+
+class FeedStore:
+    """Batched write-behind event store; latest() reads a stream back oldest first."""
+
+    def __init__(self, path: str, keep: int = FEED_STORE_KEEP):
+        self.path  = path
+        self.keep  = keep
+        self.stats = {"written": 0, "batches": 0, "dropped": 0}
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._halt = threading.Event()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = self._connect()
+        db.executescript(SCHEMA)
+        db.close()
+        self._writer = threading.Thread(target=self._write_loop, name="feed-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=5.0)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")    # WAL + NORMAL: durable across process death
+        return db
+
+    def put(self, stream: str, source: str, event_type: str, event_id: str, data,
+            t: float = None):
+        """Queue one event. Never blocks; the writer thread does the I/O."""
+        self._queue.put((stream, time.time() if t is None else t, source, event_type,
+                         event_id, json.dumps(data, separators=(",", ":"), default=str)))
+
+    def latest(self, stream: str, n: int) -> list[dict]:
+        """The newest `n` events of `stream`, oldest first."""
+        db = self._connect()
+        try:
+            rows = db.execute(
+                "SELECT t, source, type, id, data FROM events WHERE stream = ? "
+                "ORDER BY seq DESC LIMIT ?", (stream, n)
+            ).fetchall()
+        finally:
+            db.close()
+        return [
+            {"t": t, "source": source, "type": etype, "id": eid, "data": json.loads(data)}
+            for t, source, etype, eid, data in reversed(rows)
+        ]
+
+    # ── Writer thread ────────────────────────────────────────────────
+    def _write_loop(self):
+        db = self._connect()
+        while not self._halt.wait(FLUSH_EVERY):
+            self._flush(db)
+        self._flush(db)
+        db.close()
+
+    def _flush(self, db: sqlite3.Connection):
+        while True:
+            batch = []
+            try:
+                while len(batch) < BATCH_MAX:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                return
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT INTO events (stream, t, source, type, id, data) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", batch
+                    )
+                    for stream in {row[0] for row in batch}:
+                        db.execute(
+                            "DELETE FROM events WHERE stream = ? AND seq <= "
+                            "(SELECT seq FROM events WHERE stream = ? ORDER BY seq DESC "
+                            "LIMIT 1 OFFSET ?)", (stream, stream, self.keep)
+                        )
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+            except sqlite3.Error as e:
+                self.stats["dropped"] += len(batch)
+                print(f"[store] Write failed, dropped {len(batch)} events: {e}", file=sys.stderr)
+            if len(batch) < BATCH_MAX:
+                return
+
+    def close(self):
+        """Flush what is queued and stop the writer."""
+        self._halt.set()
+        self._writer.join(timeout=5.0)
+
+
+def open_store():
+    """The FEED_STORE store, or None when it is not configured or cannot open."""
+    if not FEED_STORE:
+        return None
+    try:
+        return FeedStore(FEED_STORE)
+    except sqlite3.Error as e:
+        print(f"[store] Cannot open {FEED_STORE}: {e}", file=sys.stderr)
+        return None
+
+
+def restore(store, stream: str, n: int, apply) -> int:
+    """Feed the newest `n` events of `stream` to `apply(event)`; logs the time taken."""
+    t0 = time.perf_counter()
+    events = store.latest(stream, n)
+    for ev in events:
+        apply(ev)
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"[store] Restored {len(events)} {stream} events in {ms:.1f} ms", file=sys.stderr)
+    return len(events)
+
+
+# CLI test: summarize each stream in a store
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else FEED_STORE
+    if not path or not os.path.exists(path):
+        sys.exit("usage: python feed_store.py logs/feed.db")
+    db = sqlite3.connect(path)
+    for stream, count, newest in db.execute(
+        "SELECT stream, COUNT(*), MAX(t) FROM events GROUP BY stream"
+    ):
+        age = time.time() - newest
+        print(f"  {stream:20s} {count:6d} events, newest {age:.0f}s ago")
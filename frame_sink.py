@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Frame Sink — raw-frame output for the Pygame renderers.
+In pipe mode the dashboards render into an in-memory surface and write each
+finished frame straight into FFmpeg's stdin as rawvideo. No Xvfb, no x11grab.
+
+  dashboard_*.py (pygame Surface) ──rawvideo──→ stdout ──→ ffmpeg -i pipe:0
+
+The frame fd is a private dup of stdout; fd 1 is re-pointed at stderr so a
+stray print() can never corrupt the video stream.
+"""
+
+import os
+import sys
+
+# Fixed 32-bit XRGB layout so stream.py knows the pixel format up front.
+# Little-endian memory order of 0x00RRGGBB is B, G, R, X.
+MASKS   = (0x00FF0000, 0x0000FF00, 0x000000FF, 0)
+PIX_FMT = "bgr0" if sys.byteorder == "little" else "0rgb"
+
+OUTPUT_MODE = os.environ.get("DASHBOARD_OUTPUT", "display")
+
+
+def pipe_mode() -> bool:
+    return OUTPUT_MODE == "pipe"
+
+
+def ffmpeg_input_args(width, height, fps) -> list[str]:
+    """FFmpeg input options describing the frames written by RawFrameSink."""
+    return [
+        "-f", "rawvideo",
+        "-pix_fmt", PIX_FMT,
+        "-video_size", f"{width}x{height}",
+        "-framerate", str(fps),
+        "-i", "pipe:0",
+    ]
+
+
+class RawFrameSink:
+    """Owns the render target and pushes each frame's pixel buffer to a pipe."""
+
+    def __init__(self, width: int, height: int):
+        import pygame
+        self.surface = pygame.Surface((width, height), 0, 32, MASKS)
+        self.frames  = 0
+
+        sys.stdout.flush()
+        self._fd = os.dup(1)
+        os.dup2(2, 1)
+
+    def present(self):
+        """Write the finished frame. Zero-copy: the surface buffer goes to write(2)."""
+        view = memoryview(self.surface.get_view("0"))
+        try:
+            while view:
+                n = os.write(self._fd, view)
+                view = view[n:]
+        except BrokenPipeError:
+            raise SystemExit("[frame_sink] Encoder closed the pipe.")
+        self.frames += 1
+
+    def close(self):
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
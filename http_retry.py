@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+HTTP retry helpers shared by the API clients (Moltbook, Twitter, EventSpine).
+"""
+
+import math
+import sys
+import time
+from email.utils import parsedate_to_datetime
+
+MAX_RETRY_AFTER = 3600.0    # seconds; a longer Retry-After would park a source for good
+
+
+def retry_after_seconds(value, default: float = 60.0) -> float:
+    """
+    Retry-After as seconds; accepts delta-seconds or an HTTP date. Clamped
+    to [0, MAX_RETRY_AFTER]; `default` when missing, unparseable or not finite.
+    """
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError, OverflowError):
+            return default
+    if not math.isfinite(seconds):
+        return default
+    return min(MAX_RETRY_AFTER, max(0.0, seconds))
+
+
+# CLI test
+if __name__ == "__main__":
+    for value in sys.argv[1:] or ["120", "Wed, 21 Oct 2015 07:28:00 GMT",
+                                  "Fri, 31 Dec 9999 23:59:59 GMT", "inf", "1e9", "soon", ""]:
+        print(f"  {value!r:40s} -> {retry_after_seconds(value):.0f}s")
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Ingest — push-based event intake for the dashboards.
+
+A small HTTP server inside the dashboard process (port 8080 in
+docker-compose). Producers push instead of waiting to be polled:
+
+  POST /events     EventSpine events   → dashboard_evez NetworkMap
+  POST /activity   activity items      → dashboard.py feed / ActivityFetcher
+  GET  /health     queue depths
+
+A POST body is one JSON object, a JSON array, or NDJSON. Each channel is a
+bounded queue drained by its consumer (the render loop drains once per
+frame, so a pushed event is on screen the next frame). When a queue is
+full the server answers 503 with Retry-After and the number of events it
+did accept, so the sender can resend the rest. Events are checked before
+they are queued: "type", "source", "message" and their variants must be
+strings when present, and numeric ids are turned into strings.
+
+The server can also subscribe to an upstream Server-Sent Events stream and
+feed a channel from it; a full queue then stalls the reader, which pushes
+back on the upstream connection.
+
+Anything pushed ends up on the public stream, so the server listens on
+loopback by default and will not listen anywhere else without a token.
+
+Env vars:
+  INGEST_PORT     — listen port (default 8080, 0 disables)
+  INGEST_HOST     — listen address (default 127.0.0.1; 0.0.0.0 needs INGEST_TOKEN)
+  INGEST_TOKEN    — if set, required as "Authorization: Bearer <token>"
+  INGEST_SSE_URL  — optional upstream SSE stream of spine events
+"""
+
+import ipaddress
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+INGEST_PORT    = int(os.environ.get("INGEST_PORT", "8080") or 0)
+INGEST_HOST    = os.environ.get("INGEST_HOST", "127.0.0.1")
+INGEST_TOKEN   = os.environ.get("INGEST_TOKEN", "")
+INGEST_SSE_URL = os.environ.get("INGEST_SSE_URL", "")
+
+MAX_BODY  = 1 << 20   # bytes per POST
+QUEUE_MAX = 2000      # events per channel
+
+# Fields consumers slice and format as text; anything else is passed through
+STRING_FIELDS = ("type", "event_type", "source", "message")
+ID_FIELDS     = ("id", "event_id")      # strings or numbers, as spine_client.event_id takes them
+
+
+class Channel(queue.Queue):
+    """Bounded event queue with a non-blocking batch drain for render loops."""
+
+    def drain(self, limit: int = 256) -> list:
+        items = []
+        try:
+            while len(items) < limit:
+                items.append(self.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
+
+def check_event(item) -> dict:
+    """
+    `item` if it is an object whose STRING_FIELDS are strings, with numeric
+    ids made strings; else ValueError.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("events must be JSON objects")
+    for key in ID_FIELDS:
+        value = item.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            item[key] = str(value)
+        elif value is not None and not isinstance(value, str):
+            raise ValueError(f"event {key!r} must be a string or a number")
+    for key in STRING_FIELDS:
+        if item.get(key) is not None and not isinstance(item[key], str):
+            raise ValueError(f"event {key!r} must be a string")
+    return item
+
+
+def parse_batch(body: bytes) -> list[dict]:
+    """One JSON object, a JSON array of objects, or NDJSON."""
+    text = body.decode("utf-8").strip()
+    if not text:
+        return []
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    items = data if isinstance(data, list) else [data]
+    return [check_event(item) for item in items]
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class IngestServer:
+    """Threaded HTTP intake with one bounded Channel per registered name."""
+
+    def __init__(self, channels, port: int = INGEST_PORT, token: str = INGEST_TOKEN,
+                 maxsize: int = QUEUE_MAX, host: str = INGEST_HOST):
+        self.host     = host
+        self.port     = port
+        self.token    = token
+        self.channels = {name: Channel(maxsize) for name in channels}
+        self.stats    = {"accepted": 0, "rejected": 0}
+        self._httpd   = None
+        self._stop    = threading.Event()
+
+    def channel(self, name: str) -> Channel:
+        return self.channels[name]
+
+    def start(self) -> bool:
+        """
+        Bind and serve in a daemon thread. False if the port is unavailable,
+        or if the address is not loopback and there is no token.
+        """
+        if not self.token and not is_loopback(self.host):
+            print(f"[ingest] Not listening on {self.host}: set INGEST_TOKEN to accept "
+                  f"pushes from other hosts", file=sys.stderr)
+            return False
+        try:
+            self._httpd = ThreadingHTTPServer((self.host, self.port), _handler_for(self))
+        except OSError as e:
+            print(f"[ingest] Cannot listen on {self.host}:{self.port}: {e}", file=sys.stderr)
+            return False
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="ingest-http", daemon=True).start()
+        print(f"[ingest] Listening on {self.host}:{self.port} for {', '.join(self.channels)}", file=sys.stderr)
+        return True
+
+    def offer(self, name: str, items: list[dict]) -> int:
+        """Queue items in order until the channel is full; returns how many fit."""
+        q = self.channels[name]
+        n = 0
+        try:
+            for item in items:
+                q.put_nowait(item)
+                n += 1
+        except queue.Full:
+            self.stats["rejected"] += len(items) - n
+        self.stats["accepted"] += n
+        return n
+
+    # ── SSE subscription ─────────────────────────────────────────────
+    def subscribe_sse(self, url: str, name: str):
+        """Follow an upstream SSE stream into a channel, reconnecting with backoff."""
+        threading.Thread(target=self._follow_sse, args=(url, name),
+                         name=f"ingest-sse-{name}", daemon=True).start()
+
+    def _follow_sse(self, url: str, name: str):
+        q = self.channels[name]
+        session = requests.Session()
+        last_id, delay = None, 1.0
+        while not self._stop.is_set():
+            headers = {"Accept": "text/event-stream"}
+            if last_id:
+                headers["Last-Event-ID"] = last_id
+            try:
+                with session.get(url, headers=headers, stream=True, timeout=(5, 60)) as resp:
+                    resp.raise_for_status()
+                    delay = 1.0
+                    data = []
+                    for line in resp.iter_lines(decode_unicode=True):
+                        if self._stop.is_set():
+                            return
+                        if line.startswith("data:"):
+                            data.append(line[5:].lstrip())
+                        elif line.startswith("id:"):
+                            last_id = line[3:].strip()
+                        elif not line and data:
+                            try:
+                                item = check_event(json.loads("\n".join(data)))
+                            except ValueError as e:
+                                print(f"[ingest] SSE: skipped bad event: {str(e)[:80]}", file=sys.stderr)
+                                self.stats["rejected"] += 1
+                                continue
+                            finally:
+                                data = []
+                            # Blocks while the channel is full: backpressure upstream
+                            q.put(item)
+                            self.stats["accepted"] += 1
+            except (requests.RequestException, ValueError) as e:
+                print(f"[ingest] SSE {url}: {str(e)[:80]}; retry in {delay:.0f}s", file=sys.stderr)
+            self._stop.wait(delay)
+            delay = min(delay * 2, 60.0)
+
+    def stop(self):
+        self._stop.set()
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+
+def _handler_for(server: IngestServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, code: int, payload: dict, headers: dict = None):
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._reply(404, {"error": "not found"})
+                return
+            self._reply(200, {
+                "queues": {name: q.qsize() for name, q in server.channels.items()},
+                **server.stats,
+            })
+
+        def do_POST(self):
+            name = self.path.strip("/")
+            if name not in server.channels:
+                self._reply(404, {"error": f"unknown channel {name!r}"})
+                return
+            if server.token and self.headers.get("Authorization") != f"Bearer {server.token}":
+                self._reply(401, {"error": "unauthorized"})
+                return
+            length = self.headers.get("Content-Length", "0").strip()
+            if not (length.isascii() and length.isdigit()):
+                self._reply(400, {"error": "bad Content-Length"})
+                self.close_connection = True
+                return
+            length = int(length)
+            if length > MAX_BODY:
+                self._reply(413, {"error": f"body over {MAX_BODY} bytes"})
+                self.close_connection = True
+                return
+            try:
+                items = parse_batch(self.rfile.read(length))
+            except (ValueError, UnicodeDecodeError) as e:
+                self._reply(400, {"error": str(e)[:200]})
+                return
+
+            accepted = server.offer(name, items)
+            if accepted < len(items):
+                self._reply(503, {"accepted": accepted, "queued": server.channels[name].qsize()},
+                            {"Retry-After": "1"})
+            else:
+                self._reply(202, {"accepted": accepted})
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+# CLI test: run the server and print what arrives
+if __name__ == "__main__":
+    server = IngestServer(["events", "activity"])
+    if not server.start():
+        sys.exit(1)
+    if INGEST_SSE_URL:
+        server.subscribe_sse(INGEST_SSE_URL, "events")
+    try:
+        while True:
+            for name, q in server.channels.items():
+                for item in q.drain():
+                    print(f"  [{name:8s}] {json.dumps(item)[:100]}")
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        server.stop()
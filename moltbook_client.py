@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Moltbook Client — deduplicated, conditional polling of the Moltbook posts feed.
+
+Shared by dashboard.py and ActivityFetcher. One pooled keep-alive session per
+client; each poll sends the newest post id seen so far as `since` and repeats
+the last ETag / Last-Modified validators, so an unchanged feed costs a 304.
+The API may ignore `since`, so posts are also checked against a window of
+the last SEEN_WINDOW ids and each post is returned exactly once.
+
+Errors:
+  MoltbookRateLimited — HTTP 429; `retry_after` says how long to stay away.
+  MoltbookError       — anything else that made this poll fail.
+
+Run directly to poll and print new posts (needs MOLTBOOK_API_KEY):
+  python moltbook_client.py
+"""
+
+import os
+import sys
+import time
+from collections import deque
+
+import requests
+
+from http_retry import retry_after_seconds
+
+MOLTBOOK_API_URL = os.environ.get("MOLTBOOK_API_URL", "https://www.moltbook.com/api/v1/posts")
+
+SEEN_WINDOW = 1000   # post ids remembered for dedup
+
+
+class MoltbookError(Exception):
+    """This poll failed; try again later."""
+
+
+class MoltbookRateLimited(MoltbookError):
+    def __init__(self, retry_after: float):
+        super().__init__(f"rate limited, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class MoltbookClient:
+    """Polls the posts feed; poll() returns only posts it has not returned before."""
+
+    def __init__(self, api_key: str, url: str = MOLTBOOK_API_URL, limit: int = 10,
+                 timeout: float = 15.0):
+        self.url     = url
+        self.limit   = limit
+        self.timeout = timeout
+
+        self.cursor        = None     # id of the newest post seen
+        self.etag          = None
+        self.last_modified = None
+        self._seen_order   = deque(maxlen=SEEN_WINDOW)
+        self._seen         = set()
+        self.stats         = {"requests": 0, "not_modified": 0, "new": 0, "duplicates": 0}
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Accept": "application/json",
+        })
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def remember(self, post_ids):
+        """
+        Treat these posts (oldest first) as already returned, e.g. ones a
+        restarted dashboard restored from its store; the last becomes the cursor.
+        """
+        for post_id in post_ids:
+            if post_id in self._seen:
+                continue
+            if len(self._seen_order) == SEEN_WINDOW:
+                self._seen.discard(self._seen_order[0])
+            self._seen_order.append(post_id)
+            self._seen.add(post_id)
+            self.cursor = post_id
+
+    def poll(self) -> list[dict]:
+        """New posts, oldest first. Raises MoltbookRateLimited or MoltbookError."""
+        params  = {"limit": self.limit}
+        headers = {}
+        if self.cursor:
+            params["since"] = self.cursor
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        self.stats["requests"] += 1
+        try:
+            resp = self.session.get(self.url, params=params, headers=headers, timeout=self.timeout)
+        except requests.exceptions.Timeout:
+            raise MoltbookError("API timeout")
+        except requests.exceptions.RequestException as e:
+            raise MoltbookError(str(e))
+
+        if resp.status_code == 304:
+            self.stats["not_modified"] += 1
+            return []
+        if resp.status_code == 429:
+            raise MoltbookRateLimited(retry_after_seconds(resp.headers.get("Retry-After")))
+        if resp.status_code != 200:
+            raise MoltbookError(f"HTTP {resp.status_code}")
+        try:
+            posts = resp.json().get("posts", [])
+        except (ValueError, AttributeError) as e:
+            raise MoltbookError(f"bad response: {e}")
+        if not isinstance(posts, list):
+            raise MoltbookError("bad response: posts is not a list")
+        posts = [post for post in posts if isinstance(post, dict) and post.get("id")]
+
+        self.etag          = resp.headers.get("ETag")
+        self.last_modified = resp.headers.get("Last-Modified")
+
+        # The feed lists newest first; hand posts out oldest first
+        fresh = []
+        for post in reversed(posts):
+            post_id = post["id"]
+            if post_id in self._seen:
+                self.stats["duplicates"] += 1
+                continue
+            if len(self._seen_order) == SEEN_WINDOW:
+                self._seen.discard(self._seen_order[0])
+            self._seen_order.append(post_id)
+            self._seen.add(post_id)
+            post["title"] = str(post.get("title") or "untitled")
+            fresh.append(post)
+        if posts:
+            self.cursor = posts[0]["id"]
+        self.stats["new"] += len(fresh)
+        return fresh
+
+    def close(self):
+        self.session.close()
+
+
+# CLI test
+if __name__ == "__main__":
+    api_key = os.environ.get("MOLTBOOK_API_KEY")
+    if not api_key:
+        sys.exit("MOLTBOOK_API_KEY is not set")
+    client = MoltbookClient(api_key)
+    print(f"Polling {client.url}. Press Ctrl+C to stop.")
+    try:
+        while True:
+            delay = 30
+            try:
+                for post in client.poll():
+                    print(f"  {post.get('id')}: {post.get('title', 'untitled')[:60]}")
+            except MoltbookRateLimited as e:
+                delay = e.retry_after
+                print(f"--- {e}")
+            except MoltbookError as e:
+                print(f"--- error: {e}")
+            print(f"--- {client.stats}")
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        client.close()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Recorder — append-only event log with a seek index, and a paced replayer.
+
+Every ingested event (spine, Moltbook, system, pushed) can be appended to a
+recording: one compact JSON line per event,
+
+  [time, source, id, type, data]
+
+plus a sidecar `<path>.idx` of fixed 24-byte entries written every
+INDEX_EVERY records: (latest time before, highest round before, byte offset).
+Both columns only grow, so seeking by round or time is a bisect over the
+index and a scan of at most INDEX_EVERY lines. record() only encodes the
+line and queues it; a writer thread appends and flushes every FLUSH_AFTER
+seconds, so callers holding a render-path lock never wait on the disk.
+Every record gets a string id: events without one get a fingerprint.
+
+A Replayer feeds a recording back through any callback (NetworkMap.add_event,
+ActivityFetcher.add_event) at 1×, N× or full speed, from the start or from a
+round or time. Use it to reproduce load spikes or to warm the map up after a
+restart.
+
+Env vars:
+  RECORD_PATH   — append every ingested event here (e.g. logs/evez.rec)
+  REPLAY_PATH   — replay this recording instead of polling live sources
+  REPLAY_SPEED  — 1 = real time, 10 = ten times faster, 0 = as fast as possible
+  REPLAY_FROM   — "round:<n>" or "time:<unix seconds>" to start mid-recording
+"""
+
+import bisect
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from dedup import fingerprint
+
+RECORD_PATH  = os.environ.get("RECORD_PATH", "")
+REPLAY_PATH  = os.environ.get("REPLAY_PATH", "")
+REPLAY_SPEED = float(os.environ.get("REPLAY_SPEED", "1"))
+REPLAY_FROM  = os.environ.get("REPLAY_FROM", "")
+
+INDEX_EVERY = 64
+INDEX_ENTRY = struct.Struct("<dqQ")   # time before, round before, offset
+FLUSH_AFTER = 1.0                     # seconds between writer passes
+
+
+class Record(NamedTuple):
+    t: float
+    source: str
+    id: str
+    type: str
+    data: dict
+
+
+def record_round(data) -> int:
+    r = data.get("round") if isinstance(data, dict) else None
+    return r if isinstance(r, int) else -1
+
+
+def parse_seek(spec: str) -> dict:
+    """REPLAY_FROM value → keyword arguments for Recording.records()."""
+    if not spec:
+        return {}
+    kind, _, value = spec.partition(":")
+    if kind == "round":
+        return {"round": int(value)}
+    if kind == "time":
+        return {"t": float(value)}
+    raise ValueError(f"REPLAY_FROM must be round:<n> or time:<seconds>, not {spec!r}")
+
+
+# ── Writing ──────────────────────────────────────────────────────────
+class Recorder:
+    """Appends records to a log, resuming an existing one. Thread-safe."""
+
+    def __init__(self, path: str):
+        self.path  = path
+        self.count = 0
+        self.t_max = -1.0
+        self.r_max = -1
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._resume()
+        self._log   = open(path, "ab")
+        self._index = open(path + ".idx", "ab")
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._halt  = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="recorder", daemon=True)
+        self._writer.start()
+
+    def _resume(self):
+        """Pick up count and high-water marks from an existing log and index."""
+        if not os.path.exists(self.path):
+            open(self.path + ".idx", "wb").close()
+            return
+        recording = Recording(self.path)
+        if not recording.offsets or recording.offsets[-1] > recording.size:
+            recording.reindex()
+        if not recording.offsets:
+            return
+
+        # Everything before the last index entry is accounted for by the index
+        self.count = (len(recording.offsets) - 1) * INDEX_EVERY
+        self.t_max, self.r_max = recording.times[-1], recording.rounds[-1]
+        end = recording.offsets[-1]
+        with open(self.path, "rb") as f:
+            f.seek(end)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break                       # torn write from a crash
+                rec = Recording.decode(line)
+                self.count += 1
+                self.t_max = max(self.t_max, rec.t)
+                self.r_max = max(self.r_max, record_round(rec.data))
+                end += len(line)
+        if end < recording.size:
+            os.truncate(self.path, end)
+        # Drop the last entry if its block never got a record; record() rewrites it
+        keep = len(recording.offsets) - (self.count % INDEX_EVERY == 0)
+        os.truncate(self.path + ".idx", keep * INDEX_ENTRY.size)
+
+    def record(self, source: str, event_type: str, event_id, data: dict,
+               t: Optional[float] = None):
+        """Queue one record. Never blocks on I/O; the writer thread appends it."""
+        t = time.time() if t is None else t
+        if event_id:
+            event_id = str(event_id)
+        else:
+            event_id = fingerprint({"t": t, "source": source, "type": event_type, "data": data})
+        line = json.dumps([t, source, event_id, event_type, data],
+                          separators=(",", ":"), default=str).encode() + b"\n"
+        self._queue.put((t, record_round(data), line))
+
+    # ── Writer thread ────────────────────────────────────────────────
+    def _write_loop(self):
+        while not self._halt.wait(FLUSH_AFTER):
+            self._write()
+        self._write()
+        self._log.close()
+        self._index.close()
+
+    def _write(self):
+        wrote = False
+        while True:
+            try:
+                t, r, line = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if self.count % INDEX_EVERY == 0:
+                self._log.flush()
+                self._index.write(INDEX_ENTRY.pack(self.t_max, self.r_max, self._log.tell()))
+                self._index.flush()
+            self._log.write(line)
+            self.count += 1
+            self.t_max = max(self.t_max, t)
+            self.r_max = max(self.r_max, r)
+            wrote = True
+        if wrote:
+            self._log.flush()
+
+    def close(self):
+        """Write what is queued and stop the writer."""
+        self._halt.set()
+        self._writer.join(timeout=5.0)
+
+
+# ── Reading ──────────────────────────────────────────────────────────
+class Recording:
+    """Read side of a log: index lookups and record iteration."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.times: list[float] = []
+        self.rounds: list[int]  = []
+        self.offsets: list[int] = []
+        try:
+            with open(path + ".idx", "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = b""
+        usable = len(raw) - len(raw) % INDEX_ENTRY.size
+        for t, r, off in INDEX_ENTRY.iter_unpack(raw[:usable]):
+            self.times.append(t)
+            self.rounds.append(r)
+            self.offsets.append(off)
+
+    @staticmethod
+    def decode(line: bytes) -> Record:
+        t, source, event_id, event_type, data = json.loads(line)
+        return Record(t, source, str(event_id), event_type, data)
+
+    def reindex(self):
+        """Rebuild the index from the log, e.g. after it was lost or torn."""
+        self.times, self.rounds, self.offsets = [], [], []
+        t_max, r_max, offset = -1.0, -1, 0
+        with open(self.path, "rb") as f, open(self.path + ".idx", "wb") as idx:
+            for n, line in enumerate(f):
+                if not line.endswith(b"\n"):
+                    break
+                if n % INDEX_EVERY == 0:
+                    idx.write(INDEX_ENTRY.pack(t_max, r_max, offset))
+                    self.times.append(t_max)
+                    self.rounds.append(r_max)
+                    self.offsets.append(offset)
+                rec = self.decode(line)
+                t_max = max(t_max, rec.t)
+                r_max = max(r_max, record_round(rec.data))
+                offset += len(line)
+
+    def offset(self, round: Optional[int] = None, t: Optional[float] = None) -> int:
+        """Byte offset at or before the first record reaching `round` / `t`."""
+        if round is not None:
+            i = bisect.bisect_left(self.rounds, round) - 1
+        elif t is not None:
+            i = bisect.bisect_left(self.times, t) - 1
+        else:
+            return 0
+        return self.offsets[i] if i >= 0 else 0
+
+    def records(self, round: Optional[int] = None, t: Optional[float] = None) -> Iterator[Record]:
+        """Records in log order, starting at the first with round ≥ `round` or time ≥ `t`."""
+        started = round is None and t is None
+        with open(self.path, "rb") as f:
+            f.seek(self.offset(round, t))
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return
+                rec = self.decode(line)
+                if not started:
+                    if round is not None and record_round(rec.data) < round:
+                        continue
+                    if t is not None and rec.t < t:
+                        continue
+                    started = True
+                yield rec
+
+
+# ── Replay ───────────────────────────────────────────────────────────
+class Replayer(threading.Thread):
+    """Feeds a recording to `emit(record)`, paced by the recorded timestamps."""
+
+    def __init__(self, path: str, emit: Callable[[Record], None],
+                 speed: float = REPLAY_SPEED, **seek):
+        super().__init__(daemon=True)
+        self.recording = Recording(path)
+        self.emit      = emit
+        self.speed     = speed
+        self.seek      = seek
+        self.replayed  = 0
+        self._halt     = threading.Event()
+
+    def run(self):
+        t0 = wall0 = None
+        for rec in self.recording.records(**self.seek):
+            if self._halt.is_set():
+                return
+            if self.speed > 0:
+                if t0 is None:
+                    t0, wall0 = rec.t, time.monotonic()
+                delay = wall0 + (rec.t - t0) / self.speed - time.monotonic()
+                if delay > 0 and self._halt.wait(delay):
+                    return
+            self.emit(rec)
+            self.replayed += 1
+        print(f"[replay] {self.recording.path}: {self.replayed} records done", file=sys.stderr)
+
+    def stop(self):
+        self._halt.set()
+
+
+# CLI test: summarize a recording, or print records from a seek point
+#   python recorder.py logs/evez.rec [round:<n> | time:<seconds>]
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    recording = Recording(sys.argv[1])
+    print(f"{recording.path}: {recording.size} bytes, "
+          f"{len(recording.offsets)} index entries every {INDEX_EVERY} records")
+    seek = parse_seek(sys.argv[2]) if len(sys.argv) > 2 else {}
+    for n, rec in enumerate(recording.records(**seek)):
+        if n == 20:
+            break
+        print(f"  {rec.t:.3f} [{rec.source:8s}] {rec.type:14s} {rec.id} round={record_round(rec.data)}")
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Spine Client — incremental, conditional polling of the EventSpine API.
+
+One pooled keep-alive session per client. Each poll sends the newest event id
+seen so far as `since` plus the last ETag as If-None-Match, so a quiet spine
+costs a 304 and a busy one only ships new events. Servers that ignore
+`since` still work: the client drops everything up to the cursor itself.
+
+Responses are parsed as a stream: a JSON array, {"events": [...]}, or
+NDJSON (by Content-Type) is split into raw event objects chunk by chunk,
+ids already in `seen` are skipped without decoding, and only the newest
+`max_events` survivors are kept (still as bytes) until the body ends.
+Memory stays at about one chunk plus max_events events however long the
+spine's history. Keys before an object's "events" array are skipped as
+they stream past; an object without "events" holds no events.
+
+The poll interval adapts: it halves while events keep arriving and stretches
+out when the spine is idle, between min_interval and max_interval.
+
+Errors come in two kinds:
+  SpineOffline — nothing is listening (refused, DNS). The caller may go demo.
+  SpineError   — a transient failure (timeout, 5xx, bad body). Back off, retry.
+
+Run directly to poll a spine and print what arrives:
+  python spine_client.py http://localhost:8787/api/spine/events
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+
+import requests
+
+from dedup import fingerprint
+from http_retry import retry_after_seconds
+
+SPINE_API_URL = os.environ.get(
+    "SPINE_API_URL", "http://localhost:8787/api/spine/events"
+)
+
+BACKFILL        = 20          # events taken from the first, cursor-less response
+MAX_EVENTS      = 500         # newest unseen events kept from one response
+MAX_EVENT_BYTES = 64 << 10    # one event larger than this fails the poll
+CHUNK           = 64 << 10    # bytes read from the socket at a time
+
+
+class SpineError(Exception):
+    """Transient failure: the spine is there but this poll did not work."""
+    retry_after = None   # seconds, when the spine said how long to wait (429)
+
+
+class SpineOffline(SpineError):
+    """No spine at the configured address."""
+
+
+def event_id(ev: dict) -> str:
+    """The event's id as a string; a content fingerprint if it has none."""
+    return str(ev.get("id") or ev.get("event_id") or "") or fingerprint(ev)
+
+
+def event_type(ev: dict) -> str:
+    return str(ev.get("type") or ev.get("event_type") or "UNKNOWN")
+
+
+# ── Streaming parse ──────────────────────────────────────────────────
+_STR = rb'"(?:[^"\\]|\\.)*+"'
+_OBJ = rb'\{(?:[^{}"]++|' + _STR + rb')*+\}'
+for _ in range(2):                      # objects nested up to three deep
+    _OBJ = rb'\{(?:[^{}"]++|' + _STR + rb'|' + _OBJ + rb')*+\}'
+
+_OPEN     = re.compile(rb'\s*(?:\[|\{(?:[^{}\[\]"]++|' + _STR + rb')*?"events"\s*:\s*\[)')
+_ELEMENT  = re.compile(rb'\s*,?\s*(' + _OBJ + rb')')
+_SEP      = re.compile(rb'\s*,?\s*')
+_TOKEN    = re.compile(_STR + rb'|["\[\]{}]')
+_ID_KEY   = re.compile(rb'"(id|event_id)"\s*:\s*')
+_KEY_END  = re.compile(rb'\s*(:)?\s*(\[)?')
+_SCALAR   = re.compile(_STR + rb'|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+
+
+def _element_end(buf: bytes, start: int):
+    """End of the object starting at buf[start], or None if it is incomplete."""
+    depth = 0
+    for m in _TOKEN.finditer(buf, start):
+        tok = m.group()
+        if tok in (b"{", b"["):
+            depth += 1
+        elif tok in (b"}", b"]"):
+            depth -= 1
+            if depth == 0:
+                return m.end()
+        elif tok == b'"':
+            return None                 # string runs past the buffer
+    return None
+
+
+def _find_events(buf: bytes, pos: int, depth: int):
+    """
+    Skip the top-level keys of an object body up to its "events" array.
+    Returns (pos, depth, state): state is "open" with pos just inside the
+    array, "end" if the object closed without one, or "more" with pos at
+    the first byte still needed. Raises ValueError if "events" is not an array.
+    """
+    for m in _TOKEN.finditer(buf, pos):
+        tok = m.group()
+        if tok == b'"':
+            return m.start(), depth, "more"     # string runs past the buffer
+        if tok in (b"{", b"["):
+            depth += 1
+        elif tok in (b"}", b"]"):
+            depth -= 1
+            if depth == 0:
+                return m.end(), depth, "end"
+        elif depth == 1:
+            key = _KEY_END.match(buf, m.end())
+            if key.end() == len(buf):
+                return m.start(), depth, "more"  # can't tell a key from a value yet
+            if tok == b'"events"' and key.group(1):
+                if key.group(2) == b"[":
+                    return key.end(), depth, "open"
+                raise ValueError("unexpected response shape")
+    return len(buf), depth, "more"
+
+
+def iter_events(chunks, max_event_bytes: int = MAX_EVENT_BYTES, ndjson: bool = False):
+    """
+    Raw bytes of each event object in a streamed response body. Only the
+    unconsumed tail of the body is buffered: keys before an object's
+    "events" array are skipped as they stream past.
+    Raises ValueError on a malformed or truncated body.
+    """
+    chunks = iter(chunks)
+    buf, pos, opened, depth = b"", 0, False, None
+    while True:
+        chunk = next(chunks, None)
+        buf   = buf[pos:] + (chunk or b"")
+        pos   = 0
+        if not opened and depth is None:
+            if chunk is not None and len(buf) < 256:
+                continue
+            m = None if ndjson else _OPEN.match(buf)
+            if m:
+                pos, opened = m.end(), True
+            elif not ndjson and buf.lstrip()[:1] == b"{":
+                depth = 0               # "events" is further in: skip keys to it
+            else:
+                opened = True
+        if not opened:
+            pos, depth, state = _find_events(buf, pos, depth)
+            if state == "end":
+                return
+            if state == "more":
+                if chunk is None:
+                    raise ValueError("truncated response")
+                if len(buf) - pos > max_event_bytes:
+                    raise ValueError(f"value over {max_event_bytes} bytes before \"events\"")
+                continue
+            opened = True
+
+        while True:
+            m = _ELEMENT.match(buf, pos)
+            if m:
+                yield m.group(1)
+                pos = m.end()
+                continue
+            # Incomplete, nested deeper than _OBJ, or the end of the array
+            start = _SEP.match(buf, pos).end()
+            if start == len(buf):
+                break
+            if buf[start] == ord("]"):
+                return
+            if buf[start] != ord("{"):
+                raise ValueError(f"expected an event object at byte {start}")
+            end = _element_end(buf, start)
+            if end is None:
+                if len(buf) - start > max_event_bytes:
+                    raise ValueError(f"event over {max_event_bytes} bytes")
+                break
+            yield buf[start:end]
+            pos = end
+
+        if chunk is None:
+            if buf[pos:].strip():
+                raise ValueError("truncated response")
+            return
+
+
+def _depth(raw: bytes, pos: int) -> int:
+    """Object/array nesting depth at raw[pos], which starts a token."""
+    depth = 0
+    for m in _TOKEN.finditer(raw, 0, pos):
+        tok = m.group()
+        if tok in (b"{", b"["):
+            depth += 1
+        elif tok in (b"}", b"]"):
+            depth -= 1
+    return depth
+
+
+def raw_event_id(raw: bytes):
+    """
+    The id event_id() would give, read straight from the event's bytes:
+    the top-level "id", else "event_id", as a string. None when that
+    takes a decode (no usable id, or one that is not a string or number).
+    """
+    event_id_value = None
+    for m in _ID_KEY.finditer(raw):
+        if _depth(raw, m.start()) != 1:
+            continue                    # an "id" inside a nested object
+        value = _SCALAR.match(raw, m.end())
+        if value is None:
+            return None                 # null, object, bool: let event_id() decide
+        value = value.group()
+        if value[:1] == b'"' and b"\\" not in value:
+            value = value[1:-1].decode("utf-8")
+        else:
+            value = json.loads(value)
+        if m.group(1) == b"id":
+            if value:
+                return str(value)
+        elif event_id_value is None:
+            event_id_value = value
+    return str(event_id_value) if event_id_value else None
+
+
+class SpineClient:
+    """Polls one spine endpoint; poll() returns only events it has not returned before."""
+
+    def __init__(self, url: str = SPINE_API_URL, interval: float = 5.0,
+                 min_interval: float = None, max_interval: float = None,
+                 timeout: float = 4.0, seen=None, max_events: int = MAX_EVENTS):
+        self.url          = url
+        self.timeout      = timeout
+        self.base         = interval
+        self.min_interval = min_interval or max(0.5, interval / 5)
+        self.max_interval = max_interval or interval * 6
+        self.interval     = interval
+        self.seen         = seen if seen is not None else frozenset()   # ids to skip unparsed
+        self.max_events   = max_events
+
+        self.cursor   = None     # id of the newest event returned so far
+        self.etag     = None
+        self.failures = 0        # consecutive failed polls
+        self.stats    = {"scanned": 0, "skipped": 0, "bytes": 0}
+
+        self.session = requests.Session()
+        self.session.headers.update({"Accept": "application/json"})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def poll(self) -> list[dict]:
+        """Fetch events newer than the cursor. Raises SpineOffline or SpineError."""
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        params  = {"since": self.cursor} if self.cursor else {}
+        try:
+            resp = self._get(params, headers)
+        except requests.exceptions.ConnectTimeout as e:
+            raise self._fail(SpineError(f"connect timeout: {e}"))
+        except requests.exceptions.ConnectionError as e:
+            raise self._fail(SpineOffline(str(e)))
+        except requests.exceptions.RequestException as e:
+            raise self._fail(SpineError(str(e)))
+
+        with resp:
+            if resp.status_code == 304:
+                self.failures = 0
+                return []
+            if resp.status_code == 404:
+                raise self._fail(SpineOffline(f"HTTP 404 from {self.url}"))
+            if resp.status_code == 429:
+                err = SpineError("HTTP 429")
+                err.retry_after = retry_after_seconds(resp.headers.get("Retry-After"), self.max_interval)
+                raise self._fail(err)
+            if resp.status_code != 200:
+                raise self._fail(SpineError(f"HTTP {resp.status_code}"))
+
+            try:
+                ndjson = "ndjson" in resp.headers.get("Content-Type", "")
+                events = self._read_events(resp.iter_content(CHUNK), ndjson)
+            except (ValueError, UnicodeDecodeError) as e:
+                raise self._fail(SpineError(f"bad JSON: {e}"))
+            except requests.exceptions.RequestException as e:
+                raise self._fail(SpineError(str(e)))
+
+        self.failures = 0
+        self.etag = resp.headers.get("ETag")
+        return events
+
+    def _get(self, params: dict, headers: dict) -> requests.Response:
+        """GET with one retry on a fresh connection: a reset on a reused
+        keep-alive socket is not the spine going away."""
+        try:
+            return self.session.get(self.url, params=params, headers=headers,
+                                    timeout=self.timeout, stream=True)
+        except requests.exceptions.ConnectTimeout:
+            raise
+        except requests.exceptions.ConnectionError:
+            self.session.close()        # drop pooled sockets; the next get opens a new one
+            return self.session.get(self.url, params=params, headers=headers,
+                                    timeout=self.timeout, stream=True)
+
+    def _read_events(self, chunks, ndjson: bool = False) -> list[dict]:
+        """
+        Events after the cursor, oldest first; servers that ignore `since`
+        send history the client drops itself. Events are held as raw bytes
+        in a bounded ring and decoded only if they are still there at the end.
+        """
+        keep = deque(maxlen=BACKFILL if self.cursor is None else self.max_events)
+        cursor, seen, stats = self.cursor, self.seen, self.stats
+        last = None
+        for raw in iter_events(self._counted(chunks), ndjson=ndjson):
+            stats["scanned"] += 1
+            eid = raw_event_id(raw)
+            if eid is None:
+                eid = event_id(json.loads(raw))
+            last = eid
+            if eid == cursor:
+                keep.clear()
+            elif eid in seen:
+                stats["skipped"] += 1
+            else:
+                keep.append(raw)
+
+        events = [json.loads(raw) for raw in keep]
+        if last is not None:
+            self.cursor = last
+        return events
+
+    def _counted(self, chunks):
+        for chunk in chunks:
+            self.stats["bytes"] += len(chunk)
+            yield chunk
+
+    def _fail(self, err: SpineError) -> SpineError:
+        self.failures += 1
+        return err
+
+    def next_interval(self, n_events: int) -> float:
+        """Speed up while events arrive, relax toward max_interval when idle."""
+        if n_events:
+            self.interval = max(self.min_interval, self.interval * 0.5)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+        return self.interval
+
+    def backoff(self, err: SpineError = None) -> float:
+        """Delay after a failed poll: doubles per consecutive failure, at least Retry-After."""
+        delay = min(self.max_interval, self.base * 2 ** min(self.failures - 1, 6))
+        return max(delay, err.retry_after or 0) if err else delay
+
+    def close(self):
+        self.session.close()
+
+
+# CLI test
+if __name__ == "__main__":
+    client = SpineClient(sys.argv[1] if len(sys.argv) > 1 else SPINE_API_URL, interval=2.0)
+    print(f"Polling {client.url}. Press Ctrl+C to stop.")
+    try:
+        while True:
+            try:
+                events = client.poll()
+                for ev in events:
+                    print(f"  [{event_type(ev):14s}] {event_id(ev)}")
+                delay = client.next_interval(len(events))
+                print(f"--- {len(events)} new, next poll in {delay:.1f}s")
+            except SpineOffline as e:
+                delay = client.backoff()
+                print(f"--- offline ({e}), retry in {delay:.1f}s")
+            except SpineError as e:
+                delay = client.backoff()
+                print(f"--- transient error ({e}), retry in {delay:.1f}s")
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        client.close()
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Spine Layout — struct-of-arrays force-directed layout for the EventSpine map.
+
+Node layout state (x, y, vx, vy, radius, born_at, pulse) lives in contiguous
+NumPy arrays indexed by slot. Repulsion, springs, centering, clamping and pulse
+decay are batched array operations instead of a per-pair Python loop.
+dashboard_evez.Node is a thin view onto one slot.
+
+Repulsion is pluggable:
+  ExactRepulsion — all-pairs, O(n²)
+  GridRepulsion  — uniform grid: exact near field + FFT mesh far field, ~O(n)
+
+Nodes that stay slow for SLEEP_STEPS steps fall asleep and are frozen; an
+insert wakes only its WAKE_HOPS-hop neighborhood, so a settled graph costs
+next to nothing to step.
+
+PhysicsWorker moves the stepping into its own process at a fixed timestep and
+hands positions back through shared memory, off the render thread and the GIL.
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# ── Repulsion engines ──────────────────────────────────────────────────
+def _inverse_square(dx: np.ndarray, dy: np.ndarray, d2: np.ndarray, k: float):
+    """k / d² projected on the unit vector, i.e. k·d⃗ / d³. Mutates d2."""
+    np.maximum(d2, 1.0, out=d2)
+    w = np.sqrt(d2)
+    w *= d2
+    np.divide(k, w, out=w)
+    return w
+
+
+class ExactRepulsion:
+    """All-pairs inverse-square repulsion, blocked to bound the n×n temporaries."""
+
+    BLOCK = 512
+
+    def __call__(self, px: np.ndarray, py: np.ndarray, k: float, targets: np.ndarray = None):
+        """Force on every point, or only on the points indexed by `targets`."""
+        rows = np.arange(len(px)) if targets is None else targets
+        fx = np.empty(len(rows))
+        fy = np.empty(len(rows))
+        for lo in range(0, len(rows), self.BLOCK):
+            r = rows[lo:lo + self.BLOCK]
+            dx = px[r, None] - px[None, :]
+            dy = py[r, None] - py[None, :]
+            # Self-pairs have d⃗ = 0 and contribute nothing
+            w = _inverse_square(dx, dy, dx * dx + dy * dy, k)
+            fx[lo:lo + self.BLOCK] = np.einsum("ij,ij->i", dx, w)
+            fy[lo:lo + self.BLOCK] = np.einsum("ij,ij->i", dy, w)
+        return fx, fy
+
+
+class GridRepulsion:
+    """
+    Uniform-grid repulsion (particle-particle / particle-mesh).
+
+    Nodes are bucketed into square cells sized for ~`leaf_size` nodes each.
+    Pairs whose cells lie within `ceil(1/theta)` cells of each other interact
+    exactly; everything further away acts cell-to-cell through an FFT
+    convolution of the cell counts with the 1/d² kernel. Lower theta widens
+    the exact neighborhood (more accurate, slower). Graphs of `exact_below`
+    nodes or fewer use exact all-pairs, as do small `targets` sets (a few
+    awake nodes against the whole graph).
+    """
+
+    MAX_CELLS = 256   # per axis — caps the mesh, and so the FFT, for huge spans
+
+    def __init__(self, theta: float = 1.0, leaf_size: float = 4.0, exact_below: int = 600):
+        self.theta       = theta
+        self.leaf_size   = leaf_size
+        self.exact_below = exact_below
+        self._exact      = ExactRepulsion()
+
+    def __call__(self, px: np.ndarray, py: np.ndarray, k: float, targets: np.ndarray = None):
+        n = len(px)
+        if n <= self.exact_below or (
+            targets is not None and len(targets) * n <= self.exact_below ** 2
+        ):
+            return self._exact(px, py, k, targets)
+
+        reach = max(1, int(np.ceil(1.0 / self.theta)))
+        x0, y0 = px.min(), py.min()
+        span_x, span_y = px.max() - x0, py.max() - y0
+        s = np.sqrt(max(span_x * span_y, 1.0) * self.leaf_size / n)
+        s = max(s, span_x / (self.MAX_CELLS - 1), span_y / (self.MAX_CELLS - 1), 1.0)
+
+        gx = ((px - x0) // s).astype(np.int64)
+        gy = ((py - y0) // s).astype(np.int64)
+        nx, ny = int(gx.max()) + 1, int(gy.max()) + 1
+
+        fx, fy = self._near(px, py, gx, gy, ny, reach, k)
+        mx, my = self._far(gx, gy, nx, ny, s, reach, k)
+        fx += mx[gx, gy]
+        fy += my[gx, gy]
+        if targets is not None:
+            return fx[targets], fy[targets]
+        return fx, fy
+
+    def _near(self, px, py, gx, gy, ny, reach, k):
+        """Exact pairs between cells at Chebyshev distance <= reach."""
+        n = len(px)
+        stride = ny + 2 * reach
+        key = (gx + reach) * stride + (gy + reach)
+        order = np.argsort(key, kind="stable")
+        skey  = key[order]
+        ar    = np.arange(n)
+        fx    = np.zeros(n)
+        fy    = np.zeros(n)
+
+        for ox in range(-reach, reach + 1):
+            for oy in range(-reach, reach + 1):
+                nkey = key + (ox * stride + oy)
+                lo = np.searchsorted(skey, nkey, "left")
+                cnt = np.searchsorted(skey, nkey, "right") - lo
+                total = int(cnt.sum())
+                if not total:
+                    continue
+                # Expand (node, neighbor-cell run) into explicit pairs
+                i = np.repeat(ar, cnt)
+                j = order[np.repeat(lo - (np.cumsum(cnt) - cnt), cnt) + np.arange(total)]
+                dx = px[i] - px[j]
+                dy = py[i] - py[j]
+                w = _inverse_square(dx, dy, dx * dx + dy * dy, k)
+                fx += np.bincount(i, dx * w, n)
+                fy += np.bincount(i, dy * w, n)
+        return fx, fy
+
+    def _far(self, gx, gy, nx, ny, s, reach, k):
+        """Cell-to-cell repulsion from every cell outside the exact neighborhood."""
+        counts = np.bincount(gx * ny + gy, minlength=nx * ny).reshape(nx, ny).astype(float)
+
+        ix = np.arange(-(nx - 1), nx)[:, None]
+        iy = np.arange(-(ny - 1), ny)[None, :]
+        dx, dy = ix * s, iy * s
+        w = _inverse_square(dx, dy, dx * dx + dy * dy, k)
+        w[np.maximum(np.abs(ix), np.abs(iy)) <= reach] = 0.0
+        kx, ky = dx * w, dy * w
+
+        # Linear convolution via zero-padded real FFTs, cropped to the grid
+        shape = (3 * nx - 2, 3 * ny - 2)
+        fc = np.fft.rfft2(counts, shape)
+        mx = np.fft.irfft2(fc * np.fft.rfft2(kx, shape), shape)
+        my = np.fft.irfft2(fc * np.fft.rfft2(ky, shape), shape)
+        crop = (slice(nx - 1, 2 * nx - 1), slice(ny - 1, 2 * ny - 1))
+        return mx[crop], my[crop]
+
+
+class Layout:
+    """
+    Fixed-capacity layout arrays plus an undirected edge table between slots.
+    Edges live in parallel arrays with a free list; `adjacency[slot]` holds the
+    ids of the edges touching that slot, so link and release are O(degree).
+
+    Only awake slots are integrated. A slot whose speed stays under
+    SLEEP_SPEED for SLEEP_STEPS consecutive steps goes to sleep and keeps
+    its position; sleeping slots still repel and anchor springs. wake()
+    rouses a slot's k-hop neighborhood after an insert.
+    """
+
+    K_REPEL     = 800.0
+    K_SPRING    = 0.04
+    REST_LEN    = 120.0
+    DAMPING     = 0.85
+    CENTER_PULL = 0.002
+    MARGIN      = 60
+    PULSE_S     = 3.0
+    SLEEP_SPEED = 4.0    # px/s
+    SLEEP_STEPS = 30
+    WAKE_HOPS   = 2
+
+    def __init__(self, capacity: int, width: int, height: int, repulsion=None,
+                 edge_capacity: int = None):
+        self.capacity  = capacity
+        self.width     = width
+        self.height    = height
+        self.repulsion = repulsion or GridRepulsion()
+
+        self.x       = np.zeros(capacity)
+        self.y       = np.zeros(capacity)
+        self.vx      = np.zeros(capacity)
+        self.vy      = np.zeros(capacity)
+        self.radius  = np.zeros(capacity)
+        self.born_at = np.zeros(capacity)
+        self.pulse   = np.zeros(capacity)
+        self.alive   = np.zeros(capacity, dtype=bool)
+        self.awake   = np.zeros(capacity, dtype=bool)
+        self.calm    = np.zeros(capacity, dtype=np.int32)   # consecutive slow steps
+        self.energy  = 0.0                                  # kinetic, last step
+
+        self._free = set(range(capacity))
+
+        edge_capacity = edge_capacity or 4 * capacity
+        self.edge_a     = np.zeros(edge_capacity, dtype=np.int32)
+        self.edge_b     = np.zeros(edge_capacity, dtype=np.int32)
+        self.edge_alive = np.zeros(edge_capacity, dtype=bool)
+        self.adjacency: list[set[int]] = [set() for _ in range(capacity)]
+        self._free_edges = list(range(edge_capacity - 1, -1, -1))
+
+    # ── Slots ──────────────────────────────────────────────────────────
+    def alloc(self, x: float, y: float, born_at: float, slot: int = None) -> int:
+        """Claim a free slot, or the given one when mirroring another Layout."""
+        if slot is None:
+            slot = self._free.pop()
+        else:
+            self._free.discard(slot)
+        self.x[slot], self.y[slot]   = x, y
+        self.vx[slot] = self.vy[slot] = 0.0
+        self.born_at[slot] = born_at
+        self.pulse[slot]   = 1.0
+        self.alive[slot]   = True
+        self.awake[slot]   = True
+        self.calm[slot]    = 0
+        return slot
+
+    def release(self, slot: int):
+        """Free a slot and drop every edge touching it — O(degree)."""
+        self.alive[slot] = False
+        self.awake[slot] = False
+        for eid in list(self.adjacency[slot]):
+            a, b = self.edge_a[eid], self.edge_b[eid]
+            if a != b:
+                other = b if a == slot else a
+                self.adjacency[other].discard(eid)
+                # Losing a spring unbalances the neighbor
+                self.awake[other] = True
+                self.calm[other]  = 0
+            self.edge_alive[eid] = False
+            self._free_edges.append(eid)
+        self.adjacency[slot].clear()
+        self._free.add(slot)
+
+    # ── Edges ──────────────────────────────────────────────────────────
+    def link(self, a: int, b: int) -> int:
+        if not self._free_edges:
+            self._grow_edges()
+        eid = self._free_edges.pop()
+        self.edge_a[eid], self.edge_b[eid] = a, b
+        self.edge_alive[eid] = True
+        self.adjacency[a].add(eid)
+        self.adjacency[b].add(eid)
+        return eid
+
+    def _grow_edges(self):
+        n = len(self.edge_a)
+        self.edge_a     = np.concatenate([self.edge_a, np.zeros(n, dtype=np.int32)])
+        self.edge_b     = np.concatenate([self.edge_b, np.zeros(n, dtype=np.int32)])
+        self.edge_alive = np.concatenate([self.edge_alive, np.zeros(n, dtype=bool)])
+        self._free_edges.extend(range(2 * n - 1, n - 1, -1))
+
+    def neighbors(self, slot: int) -> list[int]:
+        """Slots joined to `slot` by an edge."""
+        ea, eb = self.edge_a, self.edge_b
+        return [int(eb[e] if ea[e] == slot else ea[e]) for e in self.adjacency[slot]]
+
+    # ── Sleeping ───────────────────────────────────────────────────────
+    def wake(self, slot: int, hops: int = None):
+        """Wake `slot` and every slot within `hops` edges of it."""
+        hops = self.WAKE_HOPS if hops is None else hops
+        seen, frontier = {slot}, [slot]
+        for _ in range(hops):
+            frontier = [n for s in frontier for n in self.neighbors(s) if n not in seen]
+            seen.update(frontier)
+        idx = list(seen)
+        self.awake[idx] = True
+        self.calm[idx]  = 0
+
+    def wake_all(self):
+        self.awake[:] = self.alive
+        self.calm[:]  = 0
+
+    @property
+    def settled(self) -> bool:
+        return not self.awake.any()
+
+    def edge_slots(self) -> tuple[np.ndarray, np.ndarray]:
+        """Endpoint slots of every live edge, each undirected edge once."""
+        live = np.flatnonzero(self.edge_alive)
+        return self.edge_a[live], self.edge_b[live]
+
+    # ── Forces ─────────────────────────────────────────────────────────
+    def _springs(self) -> tuple[np.ndarray, np.ndarray]:
+        """Hooke springs along every edge, scattered back onto both endpoints."""
+        fx = np.zeros(self.capacity)
+        fy = np.zeros(self.capacity)
+        a, b = self.edge_slots()
+        if not len(a):
+            return fx, fy
+        dx = self.x[b] - self.x[a]
+        dy = self.y[b] - self.y[a]
+        dist = np.maximum(np.hypot(dx, dy), 1.0)
+        w = self.K_SPRING * (dist - self.REST_LEN) / dist
+        sx, sy = dx * w, dy * w
+        fx += np.bincount(a, sx, self.capacity) - np.bincount(b, sx, self.capacity)
+        fy += np.bincount(a, sy, self.capacity) - np.bincount(b, sy, self.capacity)
+        return fx, fy
+
+    def step(self, dt: float, now: float) -> bool:
+        """
+        One spring-repulsion layout step over the awake slots. Returns False
+        without touching positions when the whole graph is asleep.
+        """
+        live = np.flatnonzero(self.alive)
+        self.decay_pulse(now, live)
+        idx = np.flatnonzero(self.awake)
+        if not len(idx):
+            self.energy = 0.0
+            return False
+
+        # Awake slots feel every live slot; sleepers are fixed sources
+        targets = None if len(idx) == len(live) else np.searchsorted(live, idx)
+        fx, fy = self.repulsion(self.x[live], self.y[live], self.K_REPEL, targets)
+        sfx, sfy = self._springs()
+        x, y = self.x[idx], self.y[idx]
+        fx += sfx[idx] + (self.width  * 0.5 - x) * self.CENTER_PULL
+        fy += sfy[idx] + (self.height * 0.5 - y) * self.CENTER_PULL
+
+        vx = (self.vx[idx] + fx * dt) * self.DAMPING
+        vy = (self.vy[idx] + fy * dt) * self.DAMPING
+        self.vx[idx] = vx
+        self.vy[idx] = vy
+        m = self.MARGIN
+        self.x[idx] = np.clip(x + vx * dt, m, self.width  - m)
+        self.y[idx] = np.clip(y + vy * dt, m, self.height - m)
+
+        speed2 = vx * vx + vy * vy
+        self.energy = 0.5 * float(speed2.sum())
+        calm = np.where(speed2 < self.SLEEP_SPEED ** 2, self.calm[idx] + 1, 0)
+        self.calm[idx] = calm
+        asleep = idx[calm >= self.SLEEP_STEPS]
+        self.awake[asleep] = False
+        self.vx[asleep] = self.vy[asleep] = 0.0
+        return True
+
+    def decay_pulse(self, now: float, idx: np.ndarray = None):
+        """Activation pulse fades linearly over PULSE_S after a node is born."""
+        if idx is None:
+            idx = np.flatnonzero(self.alive)
+        self.pulse[idx] = np.maximum(0.0, 1.0 - (now - self.born_at[idx]) / self.PULSE_S)
+
+
+# ── Physics worker ─────────────────────────────────────────────────────
+# Shared-memory header, float64 slots. The writer bumps BEGIN before touching
+# buffer k % 2 and END after; a reader copying buffer END % 2 knows the copy
+# is intact as long as BEGIN < END + 2 afterwards (the writer only returns to
+# that buffer two steps later).
+H_BEGIN, H_END, H_APPLIED, H_STAMP = 0, 1, 2, 4     # APPLIED/STAMP: one per buffer
+HEADER = 6
+NEVER  = np.iinfo(np.int64).max
+
+
+def _physics_main(shm_name, capacity, width, height, theta, hz, commands, stop, parent_pid):
+    """Child process: drain topology commands, step at a fixed rate, publish x/y."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    header = np.ndarray((HEADER,), dtype=np.float64, buffer=shm.buf)
+    bufs = np.ndarray((2, 2, capacity), dtype=np.float64, buffer=shm.buf, offset=HEADER * 8)
+
+    layout = Layout(capacity, width, height, GridRepulsion(theta=theta))
+    dt = 1.0 / hz
+    applied, published, k = 0, 0, 0
+    next_t = time.monotonic()
+
+    def apply(cmd):
+        if cmd[0] == "add":
+            _, slot, x, y, born_at, links = cmd
+            layout.alloc(x, y, born_at, slot)
+            for other in links:
+                layout.link(slot, other)
+            layout.wake(slot)
+        else:
+            layout.release(cmd[1])
+
+    try:
+        while not stop.is_set() and os.getppid() == parent_pid:
+            # Settled graph: block on the next command instead of ticking
+            if layout.settled:
+                try:
+                    apply(commands.get(timeout=0.25))
+                    applied += 1
+                except queue.Empty:
+                    continue
+                next_t = time.monotonic()
+
+            while True:
+                try:
+                    cmd = commands.get_nowait()
+                except queue.Empty:
+                    break
+                apply(cmd)
+                applied += 1
+
+            moved = layout.step(dt, time.time())
+            if not moved and applied == published:
+                continue
+            published = applied
+
+            k += 1
+            b = k % 2
+            header[H_BEGIN] = k
+            bufs[b, 0] = layout.x
+            bufs[b, 1] = layout.y
+            header[H_APPLIED + b] = applied
+            header[H_STAMP + b] = time.monotonic()
+            header[H_END] = k
+
+            next_t += dt
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_t = time.monotonic()   # fell behind — don't try to catch up
+    finally:
+        del header, bufs
+        shm.close()
+
+
+class PhysicsWorker:
+    """
+    Runs Layout.step in a separate process at a fixed timestep.
+
+    The owner keeps its own Layout for slots, edges and born_at, and mirrors
+    every topology change here with add()/release(). Positions come back
+    through a double-buffered shared-memory block; read_into() copies them
+    into the owner's Layout without locks, interpolating between the last two
+    physics steps.
+    """
+
+    def __init__(self, capacity: int, width: int, height: int,
+                 theta: float = 1.0, hz: float = 30.0):
+        ctx = mp.get_context("spawn")
+        self.capacity = capacity
+        self.step_dt  = 1.0 / hz
+
+        self._shm = shared_memory.SharedMemory(create=True, size=(HEADER + 4 * capacity) * 8)
+        self._header = np.ndarray((HEADER,), dtype=np.float64, buffer=self._shm.buf)
+        self._bufs = np.ndarray((2, 2, capacity), dtype=np.float64,
+                                buffer=self._shm.buf, offset=HEADER * 8)
+        self._header[:] = 0
+
+        # Command sequence number at which each slot's current node was sent
+        self.added_at = np.full(capacity, NEVER, dtype=np.int64)
+        self._sent = 0
+        self._commands = ctx.Queue()
+        self._stop = ctx.Event()
+
+        # Reader side: last two published steps
+        self._seen = 0
+        self._prev = np.zeros((2, capacity))
+        self._curr = np.zeros((2, capacity))
+        self._prev_applied = self._curr_applied = 0
+        self._curr_stamp = 0.0
+
+        self._proc = ctx.Process(
+            target=_physics_main, name="spine-physics", daemon=True,
+            args=(self._shm.name, capacity, width, height, theta, hz,
+                  self._commands, self._stop, os.getpid()),
+        )
+        self._proc.start()
+
+    # ── Topology (writer thread) ───────────────────────────────────────
+    def add(self, slot: int, x: float, y: float, born_at: float, links: list[int]):
+        self._sent += 1
+        self._commands.put(("add", slot, x, y, born_at, links))
+        self.added_at[slot] = self._sent
+
+    def release(self, slot: int):
+        self.added_at[slot] = NEVER
+        self._sent += 1
+        self._commands.put(("release", slot))
+
+    # ── Positions (render thread) ──────────────────────────────────────
+    def alive(self) -> bool:
+        return self._proc.is_alive()
+
+    def _pull(self):
+        """Copy the newest published step, if any, without blocking the writer."""
+        h = self._header
+        if int(h[H_END]) == self._seen:
+            return
+        for _ in range(3):
+            end = int(h[H_END])
+            b = end % 2
+            data = self._bufs[b].copy()
+            applied, stamp = int(h[H_APPLIED + b]), h[H_STAMP + b]
+            if h[H_BEGIN] < end + 2:
+                break
+        else:
+            return
+        self._prev, self._prev_applied = self._curr, self._curr_applied
+        self._curr, self._curr_applied, self._curr_stamp = data, applied, stamp
+        self._seen = end
+
+    def read_into(self, layout: Layout):
+        """Write interpolated positions for every slot the worker has caught up on."""
+        self._pull()
+        alpha = min(1.0, max(0.0, (time.monotonic() - self._curr_stamp) / self.step_dt))
+        pos = self._prev + (self._curr - self._prev) * alpha
+
+        added = self.added_at
+        both = added <= self._prev_applied
+        newest = (added > self._prev_applied) & (added <= self._curr_applied)
+        layout.x[both], layout.y[both] = pos[0, both], pos[1, both]
+        layout.x[newest], layout.y[newest] = self._curr[0, newest], self._curr[1, newest]
+
+    def stop(self):
+        self._stop.set()
+        self._proc.join(timeout=2)
+        if self._proc.is_alive():
+            self._proc.terminate()
+        del self._header, self._bufs
+        self._shm.close()
+        self._shm.unlink()
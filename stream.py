@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 """
 MoltBot Live Stream — FFmpeg RTMP Orchestrator
-Launches xvfb + dashboard + FFmpeg pipeline to stream to YouTube Live.
+Launches dashboard + FFmpeg pipeline to stream to YouTube Live.
+
+Capture modes (CAPTURE_MODE / --capture):
+  pipe — dashboard writes rawvideo frames to stdout → FFmpeg stdin (default)
+  x11  — Xvfb + dashboard display.flip() → FFmpeg x11grab
 """
 
 import os
@@ -12,6 +16,8 @@ import time
 import argparse
 import atexit
 
+from frame_sink import ffmpeg_input_args
+
 # ── Configuration ────────────────────────────────────────────
 DISPLAY = os.environ.get("STREAM_DISPLAY", ":99")
 WIDTH = os.environ.get("RESOLUTION", "1280x720").split("x")[0]
@@ -20,6 +26,7 @@ FPS = os.environ.get("FPS", "30")
 BITRATE = os.environ.get("BITRATE", "2500k")
 YOUTUBE_RTMP_URL = os.environ.get("YOUTUBE_RTMP_URL", "rtmp://a.rtmp.youtube.com/live2")
 YOUTUBE_STREAM_KEY = os.environ.get("YOUTUBE_STREAM_KEY", "")
+CAPTURE_MODE = os.environ.get("CAPTURE_MODE", "pipe")
 
 processes = []
 
@@ -69,43 +76,66 @@ def start_xvfb():
     print(f"[stream] Xvfb running on {DISPLAY}")
     return p
 
-def start_dashboard():
+def start_dashboard(capture="x11"):
     """Launch the EVEZ OS agent POV dashboard."""
-    print("[stream] Starting EVEZ OS dashboard...")
+    print(f"[stream] Starting EVEZ OS dashboard ({capture} capture)...")
     env = os.environ.copy()
-    env["DISPLAY"] = DISPLAY
     env["STREAM_WIDTH"] = WIDTH
     env["STREAM_HEIGHT"] = HEIGHT
 
+    if capture == "pipe":
+        # Frames go to stdout; logs inherit our stderr so they can't back up
+        env["DASHBOARD_OUTPUT"] = "pipe"
+        env["DASHBOARD_FPS"] = FPS
+        env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+        stderr = None
+    else:
+        env["DISPLAY"] = DISPLAY
+        stderr = subprocess.PIPE
+
     p = subprocess.Popen(
         [sys.executable, "dashboard_evez.py"],
         env=env,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        stderr=stderr,
     )
     processes.append(p)
     time.sleep(2)
 
     if p.poll() is not None:
-        stderr = p.stderr.read().decode()
+        stderr = p.stderr.read().decode() if p.stderr else ""
         print(f"[stream] ERROR: Dashboard failed to start!\n{stderr}")
         sys.exit(1)
 
     print("[stream] EVEZ OS dashboard running.")
     return p
 
-def start_ffmpeg(preview=False):
-    """Start FFmpeg capture and RTMP stream."""
+def start_ffmpeg(preview=False, source=None):
+    """Start FFmpeg capture and RTMP stream.
+
+    With a `source` dashboard process, frames are read from its stdout pipe;
+    otherwise the Xvfb display is scraped with x11grab.
+    """
     rtmp_url = f"{YOUTUBE_RTMP_URL}/{YOUTUBE_STREAM_KEY}"
 
+    if source is not None:
+        # Video input: rawvideo frames piped from the renderer
+        video_input = ffmpeg_input_args(WIDTH, HEIGHT, FPS)
+    else:
+        # Video input: X11 screen capture
+        video_input = [
+            "-f", "x11grab",
+            "-video_size", f"{WIDTH}x{HEIGHT}",
+            "-framerate", FPS,
+            "-i", DISPLAY,
+        ]
+
     cmd = [
         "ffmpeg",
         "-y",
-        # Video input: X11 screen capture
-        "-f", "x11grab",
-        "-video_size", f"{WIDTH}x{HEIGHT}",
-        "-framerate", FPS,
-        "-i", DISPLAY,
+        "-nostats",
+        "-loglevel", "warning",
+        *video_input,
         # Audio: silent audio track (YouTube requires audio)
         "-f", "lavfi",
         "-i", "anullsrc=channel_layout=stereo:sample_rate=44100",
@@ -139,9 +169,13 @@ def start_ffmpeg(preview=False):
 
     p = subprocess.Popen(
         cmd,
-        stdout=subprocess.PIPE,
+        stdin=source.stdout if source is not None else subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
         stderr=subprocess.PIPE,
     )
+    if source is not None:
+        # FFmpeg owns the read end now; if it dies the renderer gets EPIPE
+        source.stdout.close()
     processes.append(p)
     time.sleep(3)
 
@@ -153,13 +187,41 @@ def start_ffmpeg(preview=False):
     print("[stream] FFmpeg encoding and streaming.")
     return p
 
-def monitor(dashboard_proc, ffmpeg_proc):
+def start_pipeline(capture, preview=False):
+    """Start dashboard + FFmpeg for the given capture mode."""
+    dashboard_proc = start_dashboard(capture)
+    source = dashboard_proc if capture == "pipe" else None
+    ffmpeg_proc = start_ffmpeg(preview=preview, source=source)
+    return dashboard_proc, ffmpeg_proc
+
+def stop_process(p):
+    """Terminate one child process."""
+    try:
+        p.terminate()
+        p.wait(timeout=5)
+    except Exception:
+        p.kill()
+    if p in processes:
+        processes.remove(p)
+
+def monitor(dashboard_proc, ffmpeg_proc, capture="x11", preview=False):
     """Monitor processes and restart if they crash."""
     print("[stream] \u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550")
     print("[stream] \u25cf EVEZ OS LIVE \u2014 STREAMING")
     print("[stream] \u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550\u2550")
 
     while True:
+        # Pipe mode: the two ends share one pipe, so restart them together
+        if capture == "pipe":
+            if dashboard_proc.poll() is not None or ffmpeg_proc.poll() is not None:
+                print("[stream] WARNING: Frame pipeline broke! Restarting...")
+                stop_process(dashboard_proc)
+                stop_process(ffmpeg_proc)
+                time.sleep(5)
+                dashboard_proc, ffmpeg_proc = start_pipeline(capture, preview)
+            time.sleep(10)
+            continue
+
         # Check dashboard
         if dashboard_proc.poll() is not None:
             print("[stream] WARNING: Dashboard crashed! Restarting...")
@@ -169,7 +231,7 @@ def monitor(dashboard_proc, ffmpeg_proc):
         if ffmpeg_proc.poll() is not None:
             print("[stream] WARNING: FFmpeg crashed! Restarting...")
             time.sleep(5)
-            ffmpeg_proc = start_ffmpeg()
+            ffmpeg_proc = start_ffmpeg(preview=preview)
 
         # Heartbeat
         time.sleep(10)
@@ -178,6 +240,8 @@ def main():
     parser = argparse.ArgumentParser(description="EVEZ OS Live Stream")
     parser.add_argument("--preview", action="store_true", help="Preview mode (no YouTube stream)")
     parser.add_argument("--no-xvfb", action="store_true", help="Skip Xvfb (use existing display)")
+    parser.add_argument("--capture", choices=("pipe", "x11"), default=CAPTURE_MODE,
+                        help="Frame capture: rawvideo pipe or Xvfb x11grab")
     args = parser.parse_args()
 
     if not args.preview and not YOUTUBE_STREAM_KEY:
@@ -185,18 +249,18 @@ def main():
         print("[stream] Set it in .env or export YOUTUBE_STREAM_KEY=xxxx")
         sys.exit(1)
 
-    # Start the pipeline
-    if not args.no_xvfb:
-        start_xvfb()
-    else:
-        os.environ.setdefault("DISPLAY", DISPLAY)
+    # Start the pipeline (pipe capture needs no X server)
+    if args.capture == "x11":
+        if not args.no_xvfb:
+            start_xvfb()
+        else:
+            os.environ.setdefault("DISPLAY", DISPLAY)
 
-    dashboard_proc = start_dashboard()
-    ffmpeg_proc = start_ffmpeg(preview=args.preview)
+    dashboard_proc, ffmpeg_proc = start_pipeline(args.capture, preview=args.preview)
 
     # Monitor forever
     try:
-        monitor(dashboard_proc, ffmpeg_proc)
+        monitor(dashboard_proc, ffmpeg_proc, args.capture, args.preview)
     except KeyboardInterrupt:
         print("\n[stream] Shutting down...")
         cleanup()
@@ -0,0 +1,13 @@
+from http_retry import MAX_RETRY_AFTER, retry_after_seconds
+
+
+def test_retry_after_is_clamped():
+    assert retry_after_seconds("120") == 120.0
+    assert retry_after_seconds("-5") == 0.0
+    assert retry_after_seconds("1e12") == MAX_RETRY_AFTER
+    assert retry_after_seconds("Fri, 31 Dec 9999 23:59:59 GMT") == MAX_RETRY_AFTER
+
+
+def test_retry_after_ignores_non_finite():
+    assert retry_after_seconds("inf", default=30.0) == 30.0
+    assert retry_after_seconds("nan", default=30.0) == 30.0
@@ -0,0 +1,35 @@
+import json
+
+import requests
+
+from ingest import IngestServer, parse_batch
+
+
+def test_parse_batch_numeric_ids():
+    items = parse_batch(b'[{"id": 123, "type": "FIRE"}, {"event_id": 7, "type": "NO_FIRE"}]')
+    assert [item.get("id") or item["event_id"] for item in items] == ["123", "7"]
+
+
+def test_post_numeric_id():
+    server = IngestServer(["events"], port=0)
+    assert server.start()
+    try:
+        port = server._httpd.server_address[1]
+        body = json.dumps([{"id": 123, "type": "FIRE"}, {"id": "evt-2", "type": "FIRE"}])
+        resp = requests.post(f"http://127.0.0.1:{port}/events", data=body, timeout=5)
+        assert resp.status_code == 202
+        assert resp.json() == {"accepted": 2}
+        assert [item["id"] for item in server.channel("events").drain()] == ["123", "evt-2"]
+    finally:
+        server.stop()
+
+
+def test_post_rejects_non_string_type():
+    server = IngestServer(["events"], port=0)
+    assert server.start()
+    try:
+        port = server._httpd.server_address[1]
+        resp = requests.post(f"http://127.0.0.1:{port}/events", data=b'{"type": 5}', timeout=5)
+        assert resp.status_code == 400
+    finally:
+        server.stop()
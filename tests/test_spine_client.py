@@ -0,0 +1,65 @@
+import pytest
+
+from spine_client import SpineClient, event_id, iter_events, raw_event_id
+
+
+def read(body: bytes, seen=(), ndjson=False, cursor=None):
+    client = SpineClient("http://spine.invalid/", seen=set(seen))
+    client.cursor = cursor
+    events = client._read_events([body[:7], body[7:]], ndjson)
+    return events, client.cursor
+
+
+def test_raw_event_id_skips_nested_ids():
+    assert raw_event_id(b'{"type":"FIRE","agent":{"id":"agent-7"},"id":"evt-1"}') == "evt-1"
+    assert raw_event_id(b'{"event_id":"evt-2","parent":{"id":"evt-1"}}') == "evt-2"
+    assert raw_event_id(b'{"meta":{"id":"m"},"tags":["id"]}') is None
+
+
+def test_raw_event_id_numeric():
+    assert raw_event_id(b'{"id": 123, "type": "FIRE"}') == "123"
+
+
+def test_event_id_numeric():
+    assert event_id({"id": 123, "type": "FIRE"}) == "123"
+
+
+def test_nested_id_in_seen_does_not_hide_event():
+    events, cursor = read(b'[{"event_id":"evt-2","parent":{"id":"evt-1"}}]', seen={"evt-1"})
+    assert [e["event_id"] for e in events] == ["evt-2"]
+    assert cursor == "evt-2"
+
+
+def test_body_shapes():
+    assert read(b'{"status": "ok", "count": 0}')[0] == []
+    assert read(b'{"meta": {"n": 1}, "events": [{"id": "a"}]}')[0] == [{"id": "a"}]
+    assert read(b'{"events": [{"id": "a"}, {"id": "b"}]}')[0] == [{"id": "a"}, {"id": "b"}]
+    assert read(b'{"id": "a"}\n{"id": "b"}\n', ndjson=True)[0] == [{"id": "a"}, {"id": "b"}]
+
+
+def chunked(body: bytes, size: int = 5):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def test_keys_before_events_stream_past():
+    meta = b'{"meta": {"tags": [' + b'"t", ' * 20000 + b'"t"]}, "note": "x", '
+    body = meta + b'"events": [{"id": "a"}, {"id": "b"}]}'
+    events = list(iter_events(chunked(body, 64), max_event_bytes=1024))
+    assert events == [b'{"id": "a"}', b'{"id": "b"}']
+
+
+def test_key_split_across_chunks():
+    body = b'{"pad": [' + b"0, " * 100 + b'0], "count": 2, "events"  :  [{"id": "a"}], "next": null}'
+    for size in range(1, len(body)):
+        assert list(iter_events(chunked(body, size))) == [b'{"id": "a"}']
+
+
+def test_long_value_before_events_is_bounded():
+    body = b'{"blob": "' + b"x" * 4096 + b'", "events": []}'
+    with pytest.raises(ValueError):
+        list(iter_events(chunked(body, 64), max_event_bytes=1024))
+
+
+def test_events_not_a_list():
+    with pytest.raises(ValueError):
+        read(b'{"status": "ok", "events": null}')
@@ -0,0 +1,45 @@
+import time
+
+import dashboard_evez
+from feed_store import FeedStore
+from spine_layout import Layout
+
+
+def test_release_self_loop():
+    layout = Layout(3, 800, 600)
+    slot = layout.alloc(10.0, 10.0, 0.0)
+    layout.link(slot, slot)
+    layout.release(slot)
+    assert not layout.adjacency[slot]
+    assert not layout.edge_alive.any()
+
+
+def test_small_ring_wraps(monkeypatch):
+    monkeypatch.setattr(dashboard_evez, "PHYSICS_MODE", "inline")
+    monkeypatch.setattr(dashboard_evez, "REPLAY_PATH", "replay")
+
+    for size in (1, 3, 4, 5):
+        class SmallMap(dashboard_evez.NetworkMap):
+            MAX_NODES = size
+
+        network = SmallMap()
+        for i in range(3 * size + 2):
+            network.add_event(f"evt-{i}", "FIRE", {})
+        assert len(network) == size
+        for slot in range(size):
+            assert slot not in network.layout.neighbors(slot)
+
+
+def test_restored_nodes_keep_their_age(monkeypatch, tmp_path):
+    path = str(tmp_path / "feed.db")
+    store = FeedStore(path)
+    store.put("evez", "spine", "FIRE", "evt-1", {"id": "evt-1"}, t=time.time() - 600)
+    store.close()
+    monkeypatch.setattr(dashboard_evez, "PHYSICS_MODE", "inline")
+    monkeypatch.setattr(dashboard_evez, "open_store", lambda: FeedStore(path))
+
+    network = dashboard_evez.NetworkMap()
+    network.store.close()
+    node = network.newest()
+    assert node.id == "evt-1"
+    assert node.label_state() != "STATUS: NEW"
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Text Atlas — glyph-atlas text engine for the monospace dashboards.
+
+Each (font, color) pair is rasterized once into a glyph atlas. Strings are
+drawn by blitting fixed-advance atlas cells in a single Surface.blits() call,
+and whole lines that repeat (log rows, labels, stat values) come from a small
+LRU of pre-composed line surfaces.
+
+Works with pygame.font.Font (dashboard.py) and pygame.freetype.Font
+(dashboard_evez.py). TextEngine.render_to() mirrors freetype's signature.
+"""
+
+from collections import OrderedDict
+
+import pygame
+import pygame.freetype
+
+# Printable ASCII is rasterized up front; anything else is added on first use
+PRELOAD = "".join(chr(c) for c in range(33, 127))
+
+
+class GlyphAtlas:
+    """Every glyph of one font in one color, packed into a single strip surface."""
+
+    def __init__(self, rasterize, color, advance: int, height: int):
+        self._rasterize = rasterize
+        self.color      = color
+        self.advance    = advance
+        self.height     = height
+        self.surface    = pygame.Surface((1, height), pygame.SRCALPHA)
+        self.cells: dict[str, pygame.Rect] = {}
+        self.add(PRELOAD)
+
+    def add(self, chars: str):
+        """Rasterize any glyphs not yet in the atlas and grow the strip."""
+        new = [c for c in dict.fromkeys(chars) if c not in self.cells and c != " "]
+        if not new:
+            return
+        glyphs = [self._rasterize(c, self.color) for c in new]
+        x = self.surface.get_width()
+        atlas = pygame.Surface(
+            (x + sum(g.get_width() for g in glyphs), self.height), pygame.SRCALPHA
+        )
+        # RGBA_MAX onto a zeroed surface is an exact copy, alpha included
+        atlas.blit(self.surface, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        for ch, g in zip(new, glyphs):
+            atlas.blit(g, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.cells[ch] = pygame.Rect(x, 0, g.get_width(), g.get_height())
+            x += g.get_width()
+        self.surface = atlas
+
+    def sequence(self, text: str, x: int, y: int, flags: int = 0) -> list:
+        """Blit sequence drawing `text` with its top-left at (x, y)."""
+        cells = self.cells
+        if not cells.keys() >= set(text) - {" "}:
+            self.add(text)
+        atlas, adv = self.surface, self.advance
+        return [
+            (atlas, (x + i * adv, y), cells[ch], flags)
+            for i, ch in enumerate(text) if ch != " "
+        ]
+
+
+class TextEngine:
+    """
+    Drop-in text drawing for one monospace font.
+    Proportional fallback fonts still work, through the line cache only.
+    """
+
+    def __init__(self, font, line_cache: int = 512):
+        if isinstance(font, pygame.freetype.Font):
+            # Pad to the full line box so every glyph shares one baseline
+            font.pad    = True
+            font.origin = False
+            self._rasterize = lambda text, color: font.render(text, color)[0]
+        else:
+            self._rasterize = lambda text, color: font.render(text, True, color)
+
+        probe = self._rasterize("M", (255, 255, 255))
+        self.advance, self.height = probe.get_size()
+        self.monospace = self._rasterize("i", (255, 255, 255)).get_width() == self.advance
+
+        self._atlases: dict[tuple, GlyphAtlas] = {}
+        self._lines: OrderedDict = OrderedDict()
+        self._line_cache = line_cache
+
+    def atlas(self, color) -> GlyphAtlas:
+        color = tuple(color)
+        atlas = self._atlases.get(color)
+        if atlas is None:
+            atlas = GlyphAtlas(self._rasterize, color, self.advance, self.height)
+            self._atlases[color] = atlas
+        return atlas
+
+    def size(self, text: str) -> tuple[int, int]:
+        if not self.monospace:
+            return self.line(text, (255, 255, 255)).get_size()
+        return len(text) * self.advance, self.height
+
+    def line(self, text: str, color) -> pygame.Surface:
+        """Whole-line surface for `text`, from the LRU when it repeats."""
+        key = (text, tuple(color))
+        surf = self._lines.get(key)
+        if surf is not None:
+            self._lines.move_to_end(key)
+            return surf
+
+        if self.monospace:
+            surf = pygame.Surface((max(1, len(text) * self.advance), self.height), pygame.SRCALPHA)
+            surf.blits(
+                self.atlas(color).sequence(text, 0, 0, pygame.BLEND_RGBA_MAX),
+                doreturn=False,
+            )
+        else:
+            surf = self._rasterize(text, color)
+
+        self._lines[key] = surf
+        if len(self._lines) > self._line_cache:
+            self._lines.popitem(last=False)
+        return surf
+
+    def draw(self, dest: pygame.Surface, text: str, pos, color, cache: bool = True,
+             flags: int = 0) -> int:
+        """
+        Draw `text` at `pos`. Rows that change every frame (clocks, counters)
+        should pass cache=False: they go straight from the atlas and do not
+        churn the line cache. Drawing onto a transparent SRCALPHA surface
+        wants flags=BLEND_RGBA_MAX, as line() uses, or edges come out dark.
+        """
+        if cache:
+            dest.blit(self.line(text, color), pos, special_flags=flags)
+        elif self.monospace:
+            dest.blits(self.atlas(color).sequence(text, pos[0], pos[1], flags), doreturn=False)
+        else:
+            dest.blit(self._rasterize(text, color), pos, special_flags=flags)
+        return self.height
+
+    def render_to(self, dest: pygame.Surface, pos, text: str, fgcolor, cache: bool = True) -> int:
+        """Same argument order as pygame.freetype.Font.render_to()."""
+        return self.draw(dest, text, pos, fgcolor, cache)
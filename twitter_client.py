@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Twitter Client — new tweets from one account over the v2 API.
+
+Resolves the handle to a user id once, then asks the user timeline only for
+tweets after the newest id seen (`since_id`), over one pooled session.
+
+Errors:
+  TwitterRateLimited — HTTP 429; `retry_after` comes from Retry-After or
+                       x-rate-limit-reset.
+  TwitterError       — anything else that made this poll fail.
+
+Env vars:
+  TWITTER_BEARER_TOKEN — app bearer token (the source is off without it)
+  TWITTER_HANDLE       — account to follow (default: EVEZ666)
+  TWITTER_API_URL      — API base (default: https://api.twitter.com/2)
+
+Run directly to poll and print new tweets:
+  python twitter_client.py
+"""
+
+import os
+import sys
+import time
+
+import requests
+
+from http_retry import retry_after_seconds
+
+TWITTER_BEARER_TOKEN = os.environ.get("TWITTER_BEARER_TOKEN", "")
+TWITTER_HANDLE       = os.environ.get("TWITTER_HANDLE", "EVEZ666").lstrip("@")
+TWITTER_API_URL      = os.environ.get("TWITTER_API_URL", "https://api.twitter.com/2").rstrip("/")
+
+
+class TwitterError(Exception):
+    """This poll failed; try again later."""
+
+
+class TwitterRateLimited(TwitterError):
+    def __init__(self, retry_after: float):
+        super().__init__(f"rate limited, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class TwitterClient:
+    """poll() returns tweets newer than any it has returned before, oldest first."""
+
+    def __init__(self, bearer_token: str, handle: str = TWITTER_HANDLE,
+                 api_url: str = TWITTER_API_URL, max_results: int = 10, timeout: float = 15.0):
+        self.handle      = handle
+        self.api_url     = api_url
+        self.max_results = max(5, min(100, max_results))   # API bounds
+        self.timeout     = timeout
+        self.user_id     = None
+        self.since_id    = None
+
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {bearer_token}"})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get(self, path: str, params: dict = None) -> dict:
+        try:
+            resp = self.session.get(f"{self.api_url}{path}", params=params, timeout=self.timeout)
+        except requests.exceptions.Timeout:
+            raise TwitterError("API timeout")
+        except requests.exceptions.RequestException as e:
+            raise TwitterError(str(e))
+
+        if resp.status_code == 429:
+            retry = resp.headers.get("Retry-After")
+            reset = resp.headers.get("x-rate-limit-reset")
+            if not retry and reset and reset.isdigit():
+                retry = str(max(0.0, int(reset) - time.time()))
+            raise TwitterRateLimited(retry_after_seconds(retry, default=900.0))
+        if resp.status_code != 200:
+            raise TwitterError(f"HTTP {resp.status_code}")
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise TwitterError(f"bad response: {e}")
+
+    def remember(self, tweet_ids):
+        """Start after these tweets, e.g. ones restored from a store after a restart."""
+        ids = [int(t) for t in tweet_ids if str(t).isdigit()]
+        if self.since_id and str(self.since_id).isdigit():
+            ids.append(int(self.since_id))
+        if ids:
+            self.since_id = str(max(ids))
+
+    def poll(self) -> list[dict]:
+        """New tweets, oldest first. Raises TwitterRateLimited or TwitterError."""
+        if self.user_id is None:
+            user = self._get(f"/users/by/username/{self.handle}").get("data") or {}
+            if "id" not in user:
+                raise TwitterError(f"unknown handle @{self.handle}")
+            self.user_id = user["id"]
+
+        params = {"max_results": self.max_results, "tweet.fields": "created_at"}
+        if self.since_id:
+            params["since_id"] = self.since_id
+        body = self._get(f"/users/{self.user_id}/tweets", params)
+        tweets = body.get("data") or []
+        newest = (body.get("meta") or {}).get("newest_id")
+        if newest:
+            self.since_id = newest
+        return list(reversed(tweets))
+
+    def close(self):
+        self.session.close()
+
+
+# CLI test
+if __name__ == "__main__":
+    if not TWITTER_BEARER_TOKEN:
+        sys.exit("TWITTER_BEARER_TOKEN is not set")
+    client = TwitterClient(TWITTER_BEARER_TOKEN)
+    print(f"Polling @{client.handle}. Press Ctrl+C to stop.")
+    try:
+        while True:
+            delay = 60
+            try:
+                for tweet in client.poll():
+                    print(f"  {tweet['id']}: {tweet.get('text', '')[:70]}")
+            except TwitterRateLimited as e:
+                delay = e.retry_after
+                print(f"--- {e}")
+            except TwitterError as e:
+                print(f"--- error: {e}")
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        client.close()